@@ -0,0 +1,186 @@
+import argparse
+import http.client
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import HTTPServer, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from load_report import build_report, parse_mix
+from server import CORSHTTPRequestHandler, KeepAliveCORSHTTPRequestHandler, make_server
+
+DEFAULT_MIX = "page=80,css=10,image=5,missing=5"
+
+
+class QuietCORSHTTPRequestHandler(CORSHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class QuietKeepAliveCORSHTTPRequestHandler(KeepAliveCORSHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def generate_public_tree(
+    folder: Path, pages: int, page_bytes: int, images: int, image_bytes: int
+) -> dict[str, list[str]]:
+    rng = random.Random(0)
+    paths: dict[str, list[str]] = {"page": [], "css": [], "image": [], "missing": []}
+    paragraph = "<p>" + "lorem ipsum " * (page_bytes // 12) + "</p>"
+    for i in range(pages):
+        page_folder = folder / "pages" / str(i)
+        page_folder.mkdir(parents=True)
+        (page_folder / "index.html").write_text(
+            f"<!DOCTYPE html><html><body><h1>Page {i}</h1>{paragraph}</body></html>"
+        )
+        paths["page"].append(f"/pages/{i}/")
+    (folder / "index.css").write_text("body { color: #c9d1d9; }\n" * 40)
+    paths["css"].append("/index.css")
+    (folder / "images").mkdir()
+    for i in range(images):
+        (folder / "images" / f"{i}.png").write_bytes(rng.randbytes(image_bytes))
+        paths["image"].append(f"/images/{i}.png")
+    paths["missing"] = [f"/missing/{i}.html" for i in range(10)]
+    return paths
+
+
+def worker(
+    port: int,
+    requests: list[tuple[str, str]],
+    keep_alive: bool,
+    results: list[tuple[str, float, int | None]],
+) -> None:
+    connection = None
+    for kind, path in requests:
+        start = time.perf_counter()
+        status = None
+        try:
+            if connection is None:
+                connection = http.client.HTTPConnection("localhost", port, timeout=10)
+            headers = {} if keep_alive else {"Connection": "close"}
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+            if not keep_alive or response.will_close:
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException):
+            if connection is not None:
+                connection.close()
+                connection = None
+        results.append((kind, (time.perf_counter() - start) * 1000, status))
+    if connection is not None:
+        connection.close()
+
+
+def run_load_test(
+    concurrency: int,
+    requests: int,
+    keep_alive: bool,
+    threaded: bool,
+    mix: dict[str, int],
+    pages: int,
+    page_bytes: int,
+    images: int,
+    image_bytes: int,
+    seed: int,
+) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        paths = generate_public_tree(
+            Path(directory), pages, page_bytes, images, image_bytes
+        )
+        httpd = make_server(
+            server_class=ThreadingHTTPServer if threaded else HTTPServer,
+            handler_class=(
+                QuietKeepAliveCORSHTTPRequestHandler
+                if keep_alive
+                else QuietCORSHTTPRequestHandler
+            ),
+            port=0,
+            directory=directory,
+            host="localhost",
+        )
+        port = httpd.server_address[1]
+        server_thread = threading.Thread(target=httpd.serve_forever)
+        server_thread.start()
+
+        rng = random.Random(seed)
+        kinds = [kind for kind in mix if paths.get(kind)]
+        chosen = rng.choices(kinds, [mix[kind] for kind in kinds], k=requests)
+        plan = [(kind, rng.choice(paths[kind])) for kind in chosen]
+        results: list[tuple[str, float, int | None]] = []
+        threads = [
+            threading.Thread(
+                target=worker, args=(port, plan[i::concurrency], keep_alive, results)
+            )
+            for i in range(concurrency)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        httpd.shutdown()
+        server_thread.join()
+        httpd.server_close()
+
+    return build_report(
+        results,
+        elapsed,
+        {
+            "concurrency": concurrency,
+            "requests": requests,
+            "keep_alive": keep_alive,
+            "threaded": threaded,
+            "mix": mix,
+            "pages": pages,
+            "page_bytes": page_bytes,
+            "images": images,
+            "image_bytes": image_bytes,
+            "seed": seed,
+        },
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test server.py on localhost")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--keep-alive", action="store_true")
+    parser.add_argument("--threaded", action="store_true")
+    parser.add_argument(
+        "--mix", type=str, default=DEFAULT_MIX, help="Weights per request kind"
+    )
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-bytes", type=int, default=8000)
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--image-bytes", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, help="Write the JSON report to a file")
+    args = parser.parse_args()
+
+    report = run_load_test(
+        concurrency=args.concurrency,
+        requests=args.requests,
+        keep_alive=args.keep_alive,
+        threaded=args.threaded,
+        mix=parse_mix(args.mix),
+        pages=args.pages,
+        page_bytes=args.page_bytes,
+        images=args.images,
+        image_bytes=args.image_bytes,
+        seed=args.seed,
+    )
+    report_json = json.dumps(report, indent=2)
+    print(report_json)
+    if args.output:
+        Path(args.output).write_text(report_json + "\n")
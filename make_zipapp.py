@@ -0,0 +1,52 @@
+import argparse
+import py_compile
+import tempfile
+import zipapp
+from pathlib import Path
+
+SOURCE_FOLDER = Path(__file__).parent / "src"
+MAIN_MODULE = 'from main import cli\n\nif __name__ == "__main__":\n    cli()\n'
+
+
+def compile_module(source: Path, destination: Path) -> None:
+    # Unchecked hash-based bytecode loads without a source file or timestamp check.
+    py_compile.compile(
+        str(source),
+        cfile=str(destination),
+        dfile=source.name,
+        doraise=True,
+        invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+    )
+
+
+def build_zipapp(source_folder: Path, output: Path, interpreter: str) -> list[str]:
+    modules = sorted(
+        source
+        for source in source_folder.glob("*.py")
+        if not source.name.startswith("test_")
+    )
+    with tempfile.TemporaryDirectory() as staging:
+        staging_folder = Path(staging)
+        for source in modules:
+            compile_module(source, staging_folder / f"{source.stem}.pyc")
+        main_source = staging_folder / "__main__.py"
+        main_source.write_text(MAIN_MODULE)
+        # zipapp insists on __main__.py, zipimport still prefers the .pyc next to it.
+        compile_module(main_source, staging_folder / "__main__.pyc")
+        print(f"Writing zipapp: '{output}' ({len(modules)} modules)")
+        # Stored entries skip inflating every module on each start.
+        zipapp.create_archive(staging_folder, output, interpreter, compressed=False)
+    return [source.stem for source in modules]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Package the generator as a single-file zipapp"
+    )
+    parser.add_argument("--output", type=Path, default=Path("ssg.pyz"))
+    parser.add_argument(
+        "--python", type=str, default="/usr/bin/env python3", help="Shebang line"
+    )
+    args = parser.parse_args()
+
+    build_zipapp(SOURCE_FOLDER, args.output, args.python)
@@ -0,0 +1,88 @@
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from htmlnode import ParentNode
+from markdown_processing import markdown_to_html_node, text_to_textnodes
+from textnode import text_node_to_html_node, text_nodes_to_html_nodes
+
+SPANS = [
+    "plain words & more",
+    "**bold text**",
+    "*italic text*",
+    "`code <span>`",
+    "[a link](/somewhere/)",
+    "![an image](/images/photo.png)",
+]
+
+
+def generate_paragraphs(count: int, spans: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(SPANS) for _ in range(spans)) for _ in range(count)]
+
+
+def render_per_span(paragraph_nodes: list) -> list[str]:
+    return [
+        ParentNode("p", [text_node_to_html_node(node) for node in nodes]).to_html()
+        for nodes in paragraph_nodes
+    ]
+
+
+def render_coalesced(paragraph_nodes: list) -> list[str]:
+    return [
+        ParentNode("p", text_nodes_to_html_nodes(nodes)).to_html()
+        for nodes in paragraph_nodes
+    ]
+
+
+def best_time(work, argument, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        work(argument)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(paragraphs: int, spans: int, repeats: int, seed: int) -> dict:
+    texts = generate_paragraphs(paragraphs, spans, seed)
+    paragraph_nodes = [text_to_textnodes(text) for text in texts]
+    span_count = sum(len(nodes) for nodes in paragraph_nodes)
+    per_span = best_time(render_per_span, paragraph_nodes, repeats)
+    coalesced = best_time(render_coalesced, paragraph_nodes, repeats)
+    document = "\n\n".join(texts)
+    full = best_time(
+        lambda markdown: markdown_to_html_node(markdown).to_html(), document, repeats
+    )
+    return {
+        "paragraphs": paragraphs,
+        "spans": span_count,
+        "repeats": repeats,
+        "per_span_leaf_ns": round(per_span / span_count * 1e9, 1),
+        "coalesced_ns": round(coalesced / span_count * 1e9, 1),
+        "speedup": round(per_span / coalesced, 2),
+        "markdown_to_html_ns_per_span": round(full / span_count * 1e9, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the per-span cost of inline HTML rendering"
+    )
+    parser.add_argument("--paragraphs", type=int, default=2000)
+    parser.add_argument("--spans", type=int, default=12, help="Spans per paragraph")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, help="Write the JSON report to a file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.paragraphs, args.spans, args.repeats, args.seed)
+    report_json = json.dumps(report, indent=2)
+    print(report_json)
+    if args.output:
+        Path(args.output).write_text(report_json + "\n")
@@ -1,10 +1,60 @@
 import argparse
+import json
 import os
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import queue
+import sys
+import threading
+import time
+import zlib
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from assets import ASSET_MANIFEST, ManifestIndex, fingerprinted_urls
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def content_etag(data):
+    return f'"{zlib.crc32(data):08x}-{len(data):x}"'
 
 
 class CORSHTTPRequestHandler(SimpleHTTPRequestHandler):
+    cache_headers = {}
+    manifests = ManifestIndex()
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and urlsplit(self.path).path.endswith("/"):
+            path = os.path.join(path, "index.html")
+        if not os.path.isfile(path):
+            return super().send_head()
+        manifest_path = Path(self.directory) / ASSET_MANIFEST
+        if urlsplit(self.path).path in self.manifests.urls(manifest_path):
+            self.cache_headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+            return super().send_head()
+        stat = os.stat(path)
+        if self.send_not_modified(f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'):
+            return None
+        return super().send_head()
+
+    def send_not_modified(self, etag):
+        self.cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = self.headers.get("If-None-Match", "")
+        if etag not in [tag.strip() for tag in if_none_match.split(",")]:
+            return False
+        self.send_response(304)
+        self.end_headers()
+        return True
+
     def end_headers(self):
+        for header, value in self.cache_headers.items():
+            self.send_header(header, value)
+        # Kept-alive connections reuse the handler, later responses start clean.
+        self.cache_headers = {}
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "*")
@@ -12,7 +62,229 @@ class CORSHTTPRequestHandler(SimpleHTTPRequestHandler):
 
     def do_OPTIONS(self):
         self.send_response(200, "OK")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class KeepAliveCORSHTTPRequestHandler(CORSHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+
+class OnDemandHTTPRequestHandler(CORSHTTPRequestHandler):
+    renderer = None
+
+    def do_GET(self):
+        if not self.send_rendered_page():
+            super().do_GET()
+
+    def do_HEAD(self):
+        if not self.send_rendered_page(head=True):
+            super().do_HEAD()
+
+    def send_rendered_page(self, head=False):
+        url_path = urlsplit(self.path).path
+        if self.renderer.needs_trailing_slash(url_path):
+            self.send_response(301)
+            self.send_header("Location", url_path + "/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return True
+        try:
+            html = self.renderer.render(url_path)
+        except (OSError, ValueError) as error:
+            self.log_error("Could not render %s: %s", url_path, error)
+            self.send_error(500, "Could not render page")
+            return True
+        if html is None:
+            return False
+        if self.send_not_modified(content_etag(html)):
+            return True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(html)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(html)
+        return True
+
+
+def make_on_demand_handler(content, template, static, max_cache_bytes):
+    from images import ImageSizeIndex
+    from main import IMAGE_INDEX, INCLUDES_FOLDER
+    from on_demand import OnDemandRenderer
+
+    renderer = OnDemandRenderer(
+        Path(content),
+        Path(template),
+        max_cache_bytes,
+        INCLUDES_FOLDER,
+        Path(static),
+        ImageSizeIndex(IMAGE_INDEX),
+    )
+    return type(
+        "BoundOnDemandHTTPRequestHandler",
+        (OnDemandHTTPRequestHandler,),
+        {"renderer": renderer},
+    )
+
+
+class LiveReloadHTTPRequestHandler(CORSHTTPRequestHandler):
+    broker = None
+    heartbeat_seconds = 15
+
+    def do_GET(self):
+        from livereload import LIVE_RELOAD_PATH
+
+        url = urlsplit(self.path)
+        if url.path == LIVE_RELOAD_PATH:
+            self.stream_reload_events(parse_qs(url.query).get("path", ["/"])[0])
+        elif url.path == f"{LIVE_RELOAD_PATH}/stats":
+            body = json.dumps(self.broker.stats()).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            super().do_GET()
+
+    def stream_reload_events(self, page_path):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
         self.end_headers()
+        listener = self.broker.subscribe(page_path)
+        try:
+            while True:
+                try:
+                    path = listener.get(timeout=self.heartbeat_seconds)
+                    self.wfile.write(f"data: {path}\n\n".encode())
+                except queue.Empty:
+                    self.wfile.write(b": heartbeat\n\n")
+                self.wfile.flush()
+        except OSError:
+            pass
+        finally:
+            self.broker.unsubscribe(page_path, listener)
+            self.close_connection = True
+
+
+def watch_content(broker, content, template, directory, interval):
+    from livereload import ContentWatcher
+    from main import (
+        INCLUDE_RECORD,
+        INCLUDES_FOLDER,
+        load_include_record,
+        load_live_renderer,
+        pages_including,
+        rebuild_changed_pages,
+    )
+
+    watcher = ContentWatcher(Path(content))
+    include_watcher = ContentWatcher(INCLUDES_FOLDER)
+    record = load_include_record(INCLUDE_RECORD)
+    load = partial(load_live_renderer, Path(template), Path(content))
+    while True:
+        time.sleep(interval)
+        try:
+            changed = watcher.poll()
+            changed_includes = [
+                path.relative_to(INCLUDES_FOLDER).as_posix()
+                for path in include_watcher.poll()
+            ]
+            if not changed and not changed_includes:
+                continue
+            changed_at = time.perf_counter()
+            sources = set(changed) | set(pages_including(record, changed_includes))
+            for url in rebuild_changed_pages(
+                sorted(sources), Path(content), load, Path(directory), record
+            ):
+                broker.publish(url, changed_at)
+        except Exception as error:
+            # One failed poll must not end live reload for the rest of the session.
+            print(f"Live reload poll failed: {error}")
+
+
+def make_live_reload_handler(content, template, directory, interval):
+    from livereload import ReloadBroker
+
+    broker = ReloadBroker()
+    threading.Thread(
+        target=watch_content,
+        args=(broker, content, template, directory, interval),
+        daemon=True,
+    ).start()
+    return type(
+        "BoundLiveReloadHTTPRequestHandler",
+        (LiveReloadHTTPRequestHandler,),
+        {"broker": broker},
+    )
+
+
+class ArchiveHTTPRequestHandler(CORSHTTPRequestHandler):
+    archive = None
+    fingerprinted_urls = frozenset()
+
+    def do_GET(self):
+        self.send_archive_entry()
+
+    def do_HEAD(self):
+        self.send_archive_entry(head=True)
+
+    def send_archive_entry(self, head=False):
+        url_path = unquote(urlsplit(self.path).path)
+        name = url_path.lstrip("/")
+        if name == "" or name.endswith("/"):
+            name += "index.html"
+        elif name not in self.archive and f"{name}/index.html" in self.archive:
+            self.send_response(301)
+            self.send_header("Location", url_path + "/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = self.archive.read(name)
+        if data is None:
+            self.send_error(404, "File not found")
+            return
+        if f"/{name}" in self.fingerprinted_urls:
+            self.cache_headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+        elif self.send_not_modified(content_etag(data)):
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", self.guess_type(name))
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(data)
+
+
+def make_archive_handler(archive):
+    from archive import ArchiveIndex
+
+    index = ArchiveIndex(Path(archive))
+    return type(
+        "BoundArchiveHTTPRequestHandler",
+        (ArchiveHTTPRequestHandler,),
+        {
+            "archive": index,
+            "fingerprinted_urls": fingerprinted_urls(index.read(ASSET_MANIFEST)),
+        },
+    )
+
+
+def make_server(
+    server_class=HTTPServer,
+    handler_class=CORSHTTPRequestHandler,
+    port=8000,
+    directory=None,
+    host="",
+):
+    # Resolve paths against the directory on every request instead of chdir-ing into
+    # it, so an atomically swapped `public` link is picked up without a restart.
+    if directory:
+        handler_class = partial(handler_class, directory=directory)
+    server_address = (host, port)
+    return server_class(server_address, handler_class)
 
 
 def run(
@@ -21,10 +293,7 @@ def run(
     port=8000,
     directory=None,
 ):
-    if directory:  # Change the current working directory if directory is specified
-        os.chdir(directory)
-    server_address = ("", port)
-    httpd = server_class(server_address, handler_class)
+    httpd = make_server(server_class, handler_class, port, directory)
     print(f"Serving HTTP on http://localhost:{port} from directory '{directory}'...")
     httpd.serve_forever()
 
@@ -32,9 +301,76 @@ def run(
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="HTTP Server with CORS")
     parser.add_argument(
-        "--dir", type=str, help="Directory to serve files from", default="."
+        "--dir",
+        type=str,
+        help="Directory to serve files from (default: '.', 'static' with --on-demand)",
     )
     parser.add_argument("--port", type=int, help="Port to serve HTTP on", default=8888)
+    parser.add_argument(
+        "--threaded", action="store_true", help="Handle each request in a thread"
+    )
+    parser.add_argument(
+        "--keep-alive", action="store_true", help="Keep HTTP/1.1 connections open"
+    )
+    parser.add_argument(
+        "--on-demand",
+        action="store_true",
+        help="Render pages from --content on request, serve --dir as static files",
+    )
+    parser.add_argument(
+        "--content", type=str, help="Markdown source directory", default="content"
+    )
+    parser.add_argument(
+        "--template", type=str, help="HTML template file", default="template.html"
+    )
+    parser.add_argument(
+        "--cache-bytes",
+        type=int,
+        help="Size limit of the on-demand page cache",
+        default=64 * 1024 * 1024,
+    )
+    parser.add_argument(
+        "--live-reload",
+        action="store_true",
+        help="Rebuild changed pages from --content and notify open tabs",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        help="Seconds between content checks in live-reload mode",
+        default=0.2,
+    )
+    parser.add_argument(
+        "--archive", type=str, help="Serve a .zip, .tar or .tar.gz built by main.py"
+    )
     args = parser.parse_args()
+    if args.dir is None:
+        # Pages are rendered from --content, only static files are served from disk.
+        args.dir = "static" if args.on_demand else "."
 
-    run(port=args.port, directory=args.dir)
+    if args.archive:
+        handler_class = make_archive_handler(args.archive)
+    elif args.live_reload:
+        handler_class = make_live_reload_handler(
+            args.content, args.template, args.dir, args.watch_interval
+        )
+    elif args.on_demand:
+        handler_class = make_on_demand_handler(
+            args.content, args.template, args.dir, args.cache_bytes
+        )
+    elif args.keep_alive:
+        handler_class = KeepAliveCORSHTTPRequestHandler
+    else:
+        handler_class = CORSHTTPRequestHandler
+    try:
+        run(
+            server_class=(
+                ThreadingHTTPServer if args.threaded or args.live_reload else HTTPServer
+            ),
+            handler_class=handler_class,
+            port=args.port,
+            directory=args.dir,
+        )
+    finally:
+        if args.archive:
+            handler_class.archive.close()
@@ -0,0 +1,146 @@
+import gzip
+import io
+import os
+import tarfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+# Zip timestamps cannot go below 1980, use it for tar entries too so both formats agree.
+DEFAULT_TIMESTAMP = 315532800
+PRECOMPRESSED_SUFFIXES = {".gif", ".gz", ".jpeg", ".jpg", ".png", ".webp", ".woff2"}
+
+
+def archive_format(path: Path) -> str:
+    name = path.name.lower()
+    if name.endswith(".zip"):
+        return "zip"
+    if name.endswith(".tar.gz") or name.endswith(".tgz"):
+        return "tar.gz"
+    if name.endswith(".tar"):
+        return "tar"
+    raise ValueError(f"Unsupported archive type: {path}")
+
+
+def source_date_epoch() -> int:
+    return int(os.environ.get("SOURCE_DATE_EPOCH", DEFAULT_TIMESTAMP))
+
+
+class ArchiveWriter:
+    def __init__(self, path: Path, compress: bool = False) -> None:
+        self.path = path
+        self.format = archive_format(path)
+        self.compress = compress
+        self.timestamp = max(source_date_epoch(), DEFAULT_TIMESTAMP)
+        self.last_name = ""
+        self.temporary_path = path.with_name(f".{path.name}.tmp")
+        self.file = None
+        self.gzip = None
+        self.zip = None
+        self.tar = None
+
+    def __enter__(self) -> "ArchiveWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = self.temporary_path.open("wb")
+        if self.format == "zip":
+            self.zip = zipfile.ZipFile(self.file, "w")
+            return self
+        stream = self.file
+        if self.format == "tar.gz":
+            self.gzip = gzip.GzipFile(fileobj=self.file, mode="wb", mtime=0)
+            stream = self.gzip
+        self.tar = tarfile.open(fileobj=stream, mode="w", format=tarfile.PAX_FORMAT)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self.zip is not None:
+            self.zip.close()
+        if self.tar is not None:
+            self.tar.close()
+        if self.gzip is not None:
+            self.gzip.close()
+        self.file.close()
+        if exc_type is None:
+            os.replace(self.temporary_path, self.path)
+        else:
+            self.temporary_path.unlink(missing_ok=True)
+
+    def add_bytes(self, name: str, data: bytes) -> None:
+        if name <= self.last_name:
+            raise ValueError(f"Archive entries must be added in order: {name}")
+        self.last_name = name
+        if self.zip is not None:
+            info = zipfile.ZipInfo(name, time.gmtime(self.timestamp)[:6])
+            info.external_attr = 0o644 << 16
+            info.compress_type = zipfile.ZIP_STORED
+            if self.compress and Path(name).suffix not in PRECOMPRESSED_SUFFIXES:
+                info.compress_type = zipfile.ZIP_DEFLATED
+            self.zip.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = self.timestamp
+            info.mode = 0o644
+            self.tar.addfile(info, io.BytesIO(data))
+
+    def add_text(self, name: str, text: str) -> None:
+        self.add_bytes(name, text.encode())
+
+    def add_file(self, name: str, path: Path) -> None:
+        self.add_bytes(name, path.read_bytes())
+
+
+class ArchiveIndex:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.format = archive_format(path)
+        self.lock = threading.Lock()
+        self.entries: dict[str, tuple[int, int] | zipfile.ZipInfo | bytes] = {}
+        self.zip = None
+        self.file = None
+        if self.format == "zip":
+            self.zip = zipfile.ZipFile(path)
+            for info in self.zip.infolist():
+                self.entries[info.filename] = info
+        elif self.format == "tar":
+            self.file = path.open("rb")
+            with tarfile.open(fileobj=self.file) as tar:
+                for member in tar:
+                    if member.isfile():
+                        self.entries[member.name] = (member.offset_data, member.size)
+        else:
+            # Compressed tar streams cannot be seeked, keep their contents in memory.
+            with tarfile.open(path) as tar:
+                for member in tar:
+                    if member.isfile():
+                        self.entries[member.name] = tar.extractfile(member).read()
+
+    def __enter__(self) -> "ArchiveIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self.lock:
+            if self.zip is not None:
+                self.zip.close()
+            if self.file is not None:
+                self.file.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def read(self, name: str) -> bytes | None:
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        if isinstance(entry, bytes):
+            return entry
+        with self.lock:
+            if isinstance(entry, zipfile.ZipInfo):
+                return self.zip.read(entry)
+            offset, size = entry
+            self.file.seek(offset)
+            return self.file.read(size)
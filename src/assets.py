@@ -0,0 +1,89 @@
+import json
+import re
+import shutil
+import threading
+from pathlib import Path
+
+from htmlnode import HTMLNode
+from images import file_hash
+
+FINGERPRINT_LENGTH = 10
+ASSET_MANIFEST = "asset-manifest.json"
+TEMPLATE_URL_PATTERN = re.compile(r'\b(href|src)="(/[^"]*)"')
+URL_PROPS = {"a": "href", "img": "src"}
+
+
+def manifest_json(manifest: dict[str, str]) -> str:
+    return json.dumps(manifest, indent=1, sort_keys=True)
+
+
+def fingerprinted_urls(manifest_text: str | bytes | None) -> frozenset[str]:
+    if not manifest_text:
+        return frozenset()
+    return frozenset(json.loads(manifest_text).values())
+
+
+class ManifestIndex:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.loaded: dict[Path, tuple[tuple[int, int, int], frozenset[str]]] = {}
+
+    def urls(self, manifest_path: Path) -> frozenset[str]:
+        try:
+            stat = manifest_path.stat()
+        except OSError:
+            return frozenset()
+        # A swapped `public` link points at another build, whose manifest differs.
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            entry = self.loaded.get(manifest_path)
+            if entry is None or entry[0] != key:
+                entry = (key, fingerprinted_urls(manifest_path.read_bytes()))
+                self.loaded[manifest_path] = entry
+        return entry[1]
+
+
+def fingerprint_path(relative_path: str, digest: str) -> str:
+    path = Path(relative_path)
+    return path.with_name(
+        f"{path.stem}.{digest[:FINGERPRINT_LENGTH]}{path.suffix}"
+    ).as_posix()
+
+
+def build_asset_manifest(dir_static: Path) -> dict[str, str]:
+    manifest = {}
+    for file in sorted(dir_static.rglob("*")):
+        if file.is_file():
+            relative_path = file.relative_to(dir_static).as_posix()
+            fingerprinted = fingerprint_path(relative_path, file_hash(file))
+            manifest[f"/{relative_path}"] = f"/{fingerprinted}"
+    return manifest
+
+
+def copy_fingerprinted_assets(
+    dir_static: Path, dest_dir: Path, manifest: dict[str, str]
+) -> None:
+    for url, fingerprinted_url in manifest.items():
+        source = dir_static / url.lstrip("/")
+        destination = dest_dir / fingerprinted_url.lstrip("/")
+        print(f"Copying file: '{source}' to '{destination}'")
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(source, destination)
+    if manifest:
+        manifest_path = dest_dir / ASSET_MANIFEST
+        print(f"Writing asset manifest: '{manifest_path}'")
+        manifest_path.write_text(manifest_json(manifest))
+
+
+def rewrite_template_urls(template: str, manifest: dict[str, str]) -> str:
+    return TEMPLATE_URL_PATTERN.sub(
+        lambda match: f'{match[1]}="{manifest.get(match[2], match[2])}"', template
+    )
+
+
+def rewrite_asset_urls(node: HTMLNode, manifest: dict[str, str]) -> None:
+    prop = URL_PROPS.get(node.tag or "")
+    if prop is not None and node.props and node.props.get(prop) in manifest:
+        node.props[prop] = manifest[node.props[prop]]
+    for child in node.children or []:
+        rewrite_asset_urls(child, manifest)
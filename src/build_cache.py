@@ -0,0 +1,129 @@
+import hashlib
+import os
+import uuid
+from pathlib import Path
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def cache_key(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(content_hash(part.encode()).encode())
+    return digest.hexdigest()
+
+
+class CacheBackend:
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError("get method not implemented")
+
+    def put(self, key: str, data: bytes) -> None:
+        raise NotImplementedError("put method not implemented")
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError("delete method not implemented")
+
+    def entries(self) -> list[tuple[str, int, float]]:
+        raise NotImplementedError("entries method not implemented")
+
+
+class LocalDirectoryBackend(CacheBackend):
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
+
+    def path(self, key: str) -> Path:
+        return self.folder / key[:2] / key
+
+    def get(self, key: str) -> bytes | None:
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        # Hits refresh the mtime so eviction drops the least recently used entries.
+        try:
+            os.utime(path)
+        except OSError:
+            # Another runner evicted the entry meanwhile, or the mount is read-only.
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write under a unique name first so concurrent runners sharing the folder
+        # never see a partially written entry.
+        temporary_path = path.with_name(f".{key}.{uuid.uuid4().hex}.tmp")
+        temporary_path.write_bytes(data)
+        os.replace(temporary_path, path)
+
+    def delete(self, key: str) -> None:
+        self.path(key).unlink(missing_ok=True)
+
+    def entries(self) -> list[tuple[str, int, float]]:
+        if not self.folder.exists():
+            return []
+        entries = []
+        for path in self.folder.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path.name, stat.st_size, stat.st_mtime))
+        return entries
+
+
+class BuildCache:
+    def __init__(self, backend: CacheBackend, max_bytes: int) -> None:
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.corrupt = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> str | None:
+        data = self.backend.get(key)
+        if data is None:
+            self.misses += 1
+            return None
+        checksum, _, payload = data.partition(b"\n")
+        if checksum.decode(errors="replace") != content_hash(payload):
+            print(f"Discarding corrupt cache entry: '{key}'")
+            self.backend.delete(key)
+            self.corrupt += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        return payload.decode()
+
+    def put(self, key: str, text: str) -> None:
+        payload = text.encode()
+        self.backend.put(key, content_hash(payload).encode() + b"\n" + payload)
+        self.stores += 1
+
+    def evict(self) -> None:
+        entries = sorted(self.backend.entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        for key, entry_size, _ in entries:
+            if size <= self.max_bytes:
+                break
+            self.backend.delete(key)
+            size -= entry_size
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "corrupt": self.corrupt,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
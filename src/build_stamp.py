@@ -0,0 +1,58 @@
+import os
+
+
+def scan_stats(path: str) -> list[str]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return [f"{path}\t-"]
+    if not os.path.isdir(path):
+        return [f"{path}\t{stat.st_mtime_ns}\t{stat.st_size}"]
+    lines = []
+    with os.scandir(path) as entries:
+        for entry in sorted(entries, key=lambda entry: entry.name):
+            if entry.name == "__pycache__":
+                continue
+            if entry.is_dir():
+                lines.extend(scan_stats(entry.path))
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                # A dangling link, such as an editor lock file.
+                lines.append(f"{entry.path}\t-")
+                continue
+            lines.append(f"{entry.path}\t{stat.st_mtime_ns}\t{stat.st_size}")
+    return lines
+
+
+def input_stamp(paths: list[str], options: list[str]) -> str:
+    lines = ["\t".join(options)]
+    for path in paths:
+        lines.extend(scan_stats(path))
+    return "\n".join(lines) + "\n"
+
+
+def is_up_to_date(stamp_path: str, stamp: str) -> bool:
+    try:
+        with open(stamp_path) as file:
+            output_path = file.readline().rstrip("\n")
+            recorded = file.read()
+    except FileNotFoundError:
+        return False
+    return recorded == stamp and os.path.exists(output_path)
+
+
+def write_stamp(stamp_path: str, output_path: str, stamp: str) -> None:
+    os.makedirs(os.path.dirname(stamp_path) or ".", exist_ok=True)
+    temporary_path = f"{stamp_path}.tmp"
+    with open(temporary_path, "w") as file:
+        file.write(f"{output_path}\n{stamp}")
+    os.replace(temporary_path, stamp_path)
+
+
+def remove_stamp(stamp_path: str) -> None:
+    try:
+        os.remove(stamp_path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,70 @@
+from pathlib import Path
+
+FRONT_MATTER_DELIMITER = "---"
+
+Metadata = dict[str, str | list[str]]
+
+
+def parse_front_matter_lines(lines: list[str]) -> Metadata:
+    metadata: Metadata = {}
+    key = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") and key is not None:
+            value = metadata.setdefault(key, [])
+            if not isinstance(value, list):
+                raise ValueError(f"Invalid front matter: '{key}' is not a list")
+            value.append(unquote(stripped[2:]))
+            continue
+        if ":" not in stripped:
+            raise ValueError(f"Invalid front matter line: {line}")
+        key, value = stripped.split(":", 1)
+        key = key.strip()
+        value = value.strip()
+        if value.startswith("[") and value.endswith("]"):
+            metadata[key] = [unquote(v) for v in value[1:-1].split(",") if v.strip()]
+        elif value:
+            metadata[key] = unquote(value)
+        else:
+            metadata[key] = []
+    return metadata
+
+
+def unquote(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def split_front_matter(markdown: str) -> tuple[Metadata, str]:
+    lines = markdown.split("\n")
+    if not lines or lines[0].strip() != FRONT_MATTER_DELIMITER:
+        return {}, markdown
+    for i, line in enumerate(lines[1:], 1):
+        if line.strip() == FRONT_MATTER_DELIMITER:
+            return parse_front_matter_lines(lines[1:i]), "\n".join(lines[i + 1 :])
+    raise ValueError("Invalid front matter: missing closing delimiter")
+
+
+def read_page_metadata(path: Path) -> Metadata:
+    metadata: Metadata = {}
+    with path.open() as file:
+        line = file.readline()
+        if line.strip() == FRONT_MATTER_DELIMITER:
+            lines = []
+            for line in file:
+                if line.strip() == FRONT_MATTER_DELIMITER:
+                    break
+                lines.append(line)
+            else:
+                raise ValueError("Invalid front matter: missing closing delimiter")
+            metadata = parse_front_matter_lines(lines)
+            line = file.readline()
+        while line and "title" not in metadata:
+            if line.startswith("# "):
+                metadata["title"] = line[2:].strip()
+            line = file.readline()
+    return metadata
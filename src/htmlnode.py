@@ -1,3 +1,13 @@
+TEXT_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+ATTRIBUTE_ESCAPES = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}
+)
+
+
+def escape_text(text: str) -> str:
+    return text.translate(TEXT_ESCAPES)
+
+
 class HTMLNode:
     def __init__(
         self,
@@ -15,11 +25,12 @@ class HTMLNode:
         raise NotImplementedError("to_html method not implemented")
 
     def props_to_html(self) -> str:
-        props_html = ""
-        if self.props:
-            for prop, value in self.props.items():
-                props_html += f' {prop}="{value}"'
-        return props_html
+        if not self.props:
+            return ""
+        return "".join(
+            f' {prop}="{value.translate(ATTRIBUTE_ESCAPES)}"'
+            for prop, value in self.props.items()
+        )
 
     def __repr__(self) -> str:
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
@@ -68,8 +79,6 @@ class ParentNode(HTMLNode):
         if self.children is None:
             raise ValueError("Invalid HTML: no children")
 
-        children_html = ""
-        for child in self.children:
-            children_html += child.to_html()
+        children_html = "".join(child.to_html() for child in self.children)
 
         return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
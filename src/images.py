@@ -0,0 +1,145 @@
+import hashlib
+import json
+import struct
+from pathlib import Path
+from typing import BinaryIO
+
+from htmlnode import HTMLNode
+
+IMAGE_SUFFIXES = {".gif", ".jpeg", ".jpg", ".png", ".webp"}
+HEADER_BYTES = 32
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+ImageSize = tuple[int, int]
+
+
+def read_image_size(file: BinaryIO) -> ImageSize | None:
+    header = file.read(HEADER_BYTES)
+    if header.startswith(b"\x89PNG\r\n\x1a\n") and header[12:16] == b"IHDR":
+        return struct.unpack(">II", header[16:24])
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return struct.unpack("<HH", header[6:10])
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return read_webp_size(header)
+    if header[:2] == b"\xff\xd8":
+        file.seek(2)
+        return read_jpeg_size(file)
+    return None
+
+
+def read_webp_size(header: bytes) -> ImageSize | None:
+    chunk = header[12:16]
+    if chunk == b"VP8 " and header[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and header[20:21] == b"\x2f":
+        bits = int.from_bytes(header[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        width = int.from_bytes(header[24:27], "little") + 1
+        height = int.from_bytes(header[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def read_jpeg_size(file: BinaryIO) -> ImageSize | None:
+    while True:
+        byte = file.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+        marker = file.read(1)
+        while marker == b"\xff":
+            marker = file.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code == 0xD8 or code == 0x01 or 0xD0 <= code <= 0xD7:
+            continue
+        if code == 0xD9 or code == 0xDA:
+            return None
+        length_bytes = file.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        if code in JPEG_SOF_MARKERS:
+            segment = file.read(5)
+            if len(segment) < 5:
+                return None
+            height, width = struct.unpack(">HH", segment[1:5])
+            return width, height
+        file.seek(length - 2, 1)
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImageSizeIndex:
+    def __init__(self, index_path: Path) -> None:
+        self.index_path = index_path
+        self.files: dict[str, list] = {}
+        self.sizes: dict[str, list[int] | None] = {}
+        self.headers_read = 0
+        if index_path.exists():
+            data = json.loads(index_path.read_text())
+            self.files = data["files"]
+            self.sizes = data["sizes"]
+
+    def save(self) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.index_path.write_text(
+            json.dumps({"files": self.files, "sizes": self.sizes}, sort_keys=True)
+        )
+
+    def size_of(self, path: Path, name: str) -> ImageSize | None:
+        stat = path.stat()
+        known = self.files.get(name)
+        if known is not None and known[:2] == [stat.st_mtime_ns, stat.st_size]:
+            digest = known[2]
+        else:
+            digest = file_hash(path)
+            self.files[name] = [stat.st_mtime_ns, stat.st_size, digest]
+        if digest not in self.sizes:
+            print(f"Reading image header: '{path}'")
+            with path.open("rb") as file:
+                size = read_image_size(file)
+            self.sizes[digest] = list(size) if size else None
+            self.headers_read += 1
+        size = self.sizes[digest]
+        return (size[0], size[1]) if size else None
+
+    def scan(self, static_folder: Path) -> dict[str, ImageSize]:
+        image_sizes = {}
+        seen = set()
+        for path in sorted(static_folder.rglob("*")):
+            if path.suffix.lower() not in IMAGE_SUFFIXES or not path.is_file():
+                continue
+            name = path.relative_to(static_folder).as_posix()
+            seen.add(name)
+            size = self.size_of(path, name)
+            if size is not None:
+                image_sizes[f"/{name}"] = size
+        self.files = {name: self.files[name] for name in seen}
+        used = {known[2] for known in self.files.values()}
+        self.sizes = {digest: self.sizes[digest] for digest in used}
+        return image_sizes
+
+
+def add_image_attributes(node: HTMLNode, image_sizes: dict[str, ImageSize]) -> None:
+    if node.tag == "img" and node.children is None:
+        props = node.props if node.props is not None else {}
+        size = image_sizes.get(props.get("src", ""))
+        if size is not None:
+            props["width"] = str(size[0])
+            props["height"] = str(size[1])
+        props["loading"] = "lazy"
+        props["decoding"] = "async"
+        node.props = props
+    for child in node.children or []:
+        add_image_attributes(child, image_sizes)
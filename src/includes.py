@@ -0,0 +1,65 @@
+from collections.abc import Callable
+from pathlib import Path
+
+from build_cache import content_hash
+from frontmatter import split_front_matter
+from markdown_processing import include_target, markdown_to_blocks
+
+
+def find_includes(markdown_content: str) -> list[str]:
+    names = []
+    for block in markdown_to_blocks(markdown_content):
+        name = include_target(block)
+        if name is not None and name not in names:
+            names.append(name)
+    return names
+
+
+class IncludeLibrary:
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
+        self.sources: dict[str, str] = {}
+        self.fragments: dict[str, str] = {}
+        self.rendering: list[str] = []
+        self.renders = 0
+
+    def source(self, name: str) -> str:
+        if name not in self.sources:
+            folder = self.folder.resolve()
+            path = (folder / name).resolve()
+            if not path.is_relative_to(folder) or not path.is_file():
+                raise ValueError(f"Include not found: '{name}' in '{self.folder}'")
+            _, self.sources[name] = split_front_matter(path.read_text())
+        return self.sources[name]
+
+    def dependencies(self, markdown_content: str) -> list[str]:
+        found: list[str] = []
+
+        def visit(names: list[str], stack: list[str]) -> None:
+            for name in names:
+                if name in stack:
+                    raise ValueError(f"Include cycle: {' -> '.join([*stack, name])}")
+                if name not in found:
+                    found.append(name)
+                    visit(find_includes(self.source(name)), [*stack, name])
+
+        visit(find_includes(markdown_content), [])
+        return sorted(found)
+
+    def digests(self, markdown_content: str) -> list[str]:
+        return [
+            f"{name}:{content_hash(self.source(name).encode())}"
+            for name in self.dependencies(markdown_content)
+        ]
+
+    def fragment(self, name: str, render: Callable[[str], str]) -> str:
+        if name in self.rendering:
+            raise ValueError(f"Include cycle: {' -> '.join([*self.rendering, name])}")
+        if name not in self.fragments:
+            self.rendering.append(name)
+            try:
+                self.fragments[name] = render(self.source(name))
+            finally:
+                self.rendering.pop()
+            self.renders += 1
+        return self.fragments[name]
@@ -0,0 +1,134 @@
+import json
+import posixpath
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from frontmatter import split_front_matter
+from htmlnode import ATTRIBUTE_ESCAPES
+from markdown_processing import split_nodes_image, split_nodes_link
+from metadata_index import page_url
+from textnode import TextNode, TextType
+
+GRAPH_VERSION = 1
+
+
+def extract_links(markdown_content: str) -> list[str]:
+    _, body = split_front_matter(markdown_content)
+    nodes = split_nodes_link(split_nodes_image([TextNode(body, TextType.TEXT)]))
+    return [node.url for node in nodes if node.text_type is TextType.LINK and node.url]
+
+
+def normalize_link(url: str, from_url: str) -> str | None:
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    path = parts.path
+    if not path.startswith("/"):
+        path = posixpath.join(posixpath.dirname(from_url), path)
+    normalized = posixpath.normpath(path)
+    if path.endswith("/") and normalized != "/":
+        normalized += "/"
+    return normalized
+
+
+def output_urls(output_paths: list[str]) -> set[str]:
+    urls = set()
+    for output_path in output_paths:
+        url = "/" + output_path.lstrip("/")
+        urls.add(url)
+        if url.endswith("/index.html"):
+            folder = url[: -len("index.html")]
+            urls.add(folder)
+            if folder != "/":
+                urls.add(folder.rstrip("/"))
+    return urls
+
+
+def prefetch_tags(urls: list[str]) -> str:
+    return "".join(
+        f'<link rel="prefetch" href="{url.translate(ATTRIBUTE_ESCAPES)}">'
+        for url in urls
+    )
+
+
+class LinkGraph:
+    def __init__(self, graph_path: Path) -> None:
+        self.graph_path = graph_path
+        self.pages: dict[str, dict] = {}
+        if graph_path.exists():
+            data = json.loads(graph_path.read_text())
+            if data.get("version") == GRAPH_VERSION:
+                self.pages = data["pages"]
+
+    def save(self) -> None:
+        self.graph_path.parent.mkdir(parents=True, exist_ok=True)
+        self.graph_path.write_text(
+            json.dumps({"version": GRAPH_VERSION, "pages": self.pages}, sort_keys=True)
+        )
+
+    def update(self, dir_content: Path) -> None:
+        pages = {}
+        for file in sorted(dir_content.rglob("*.md")):
+            if not file.is_file():
+                # Dangling links such as editor lock files are not pages.
+                continue
+            relative_path = file.relative_to(dir_content).as_posix()
+            stat = file.stat()
+            entry = self.pages.get(relative_path)
+            if (
+                entry is None
+                or entry["mtime_ns"] != stat.st_mtime_ns
+                or entry["size"] != stat.st_size
+            ):
+                url = page_url(Path(relative_path))
+                links = []
+                for link in extract_links(file.read_text()):
+                    target = normalize_link(link, url)
+                    if target is not None and target not in links:
+                        links.append(target)
+                entry = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "url": url,
+                    "links": links,
+                }
+            pages[relative_path] = entry
+        self.pages = pages
+
+    def broken_links(self, known_urls: set[str]) -> list[tuple[str, str]]:
+        return [
+            (source, link)
+            for source, entry in sorted(self.pages.items())
+            for link in entry["links"]
+            if link not in known_urls
+        ]
+
+    def inbound_counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for entry in self.pages.values():
+            for link in entry["links"]:
+                counts[canonical_url(link)] = counts.get(canonical_url(link), 0) + 1
+        return counts
+
+    def prefetch_urls(self, known_urls: set[str], limit: int) -> dict[str, list[str]]:
+        counts = self.inbound_counts()
+        prefetch = {}
+        for source, entry in self.pages.items():
+            candidates = []
+            for link in entry["links"]:
+                url = canonical_url(link)
+                if link in known_urls and url != entry["url"] and url not in candidates:
+                    candidates.append(url)
+            # Sorting is stable, so equally popular links keep their page order.
+            ranked = sorted(candidates, key=lambda url: -counts.get(url, 0))
+            if ranked:
+                prefetch[source] = ranked[:limit]
+        return prefetch
+
+
+def canonical_url(url: str) -> str:
+    if url.endswith("/index.html"):
+        return url[: -len("index.html")]
+    if url != "/" and not url.endswith("/") and "." not in posixpath.basename(url):
+        return url + "/"
+    return url
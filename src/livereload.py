@@ -0,0 +1,90 @@
+import queue
+import threading
+import time
+from pathlib import Path
+
+LIVE_RELOAD_PATH = "/__livereload"
+CLIENT_SCRIPT = (
+    "<script>new EventSource("
+    f'"{LIVE_RELOAD_PATH}?path=" + encodeURIComponent(location.pathname)'
+    ").onmessage = () => location.reload();</script>"
+)
+
+
+def inject_live_reload(template: str) -> str:
+    if "</body>" in template:
+        return template.replace("</body>", f"{CLIENT_SCRIPT}\n</body>", 1)
+    return template + CLIENT_SCRIPT
+
+
+def normalize_page_path(path: str) -> str:
+    if path.endswith("/index.html"):
+        return path[: -len("index.html")]
+    return path
+
+
+class ReloadBroker:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.listeners: dict[str, list[queue.Queue]] = {}
+        self.latencies: list[float] = []
+
+    def subscribe(self, path: str) -> queue.Queue:
+        listener: queue.Queue = queue.Queue()
+        with self.lock:
+            self.listeners.setdefault(normalize_page_path(path), []).append(listener)
+        return listener
+
+    def unsubscribe(self, path: str, listener: queue.Queue) -> None:
+        path = normalize_page_path(path)
+        with self.lock:
+            listeners = self.listeners.get(path, [])
+            if listener in listeners:
+                listeners.remove(listener)
+            if not listeners:
+                self.listeners.pop(path, None)
+
+    def publish(self, path: str, changed_at: float) -> int:
+        with self.lock:
+            listeners = list(self.listeners.get(normalize_page_path(path), []))
+            latency = (time.perf_counter() - changed_at) * 1000
+            self.latencies.append(latency)
+        for listener in listeners:
+            listener.put(path)
+        print(f"Notified {len(listeners)} tab(s) of '{path}' after {latency:.1f} ms")
+        return len(listeners)
+
+    def stats(self) -> dict[str, float | int]:
+        with self.lock:
+            latencies = sorted(self.latencies)
+        if not latencies:
+            return {"notifications": 0}
+        return {
+            "notifications": len(latencies),
+            "latency_ms_p50": round(latencies[len(latencies) // 2], 3),
+            "latency_ms_max": round(latencies[-1], 3),
+        }
+
+
+class ContentWatcher:
+    def __init__(self, content_folder: Path) -> None:
+        self.content_folder = content_folder
+        self.mtimes = self.snapshot()
+
+    def snapshot(self) -> dict[Path, int]:
+        mtimes = {}
+        for file in self.content_folder.rglob("*.md"):
+            try:
+                mtimes[file] = file.stat().st_mtime_ns
+            except OSError:
+                # Editor lock links and files deleted mid-scan have nothing to stat.
+                continue
+        return mtimes
+
+    def poll(self) -> list[Path]:
+        mtimes = self.snapshot()
+        changed = [
+            file for file, mtime in mtimes.items() if self.mtimes.get(file) != mtime
+        ]
+        self.mtimes = mtimes
+        return sorted(changed)
@@ -0,0 +1,42 @@
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        kind, weight = part.split("=")
+        weights[kind.strip()] = int(weight)
+    return weights
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(percent / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def build_report(
+    results: list[tuple[str, float, int | None]], elapsed: float, config: dict
+) -> dict:
+    latencies = sorted(latency for _, latency, _ in results)
+    statuses: dict[str, int] = {}
+    errors = 0
+    for kind, _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+        expected = 404 if kind == "missing" else 200
+        if status != expected:
+            errors += 1
+    return {
+        "config": config,
+        "elapsed_seconds": round(elapsed, 4),
+        "completed": len(results),
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+        "statuses": statuses,
+        "errors": errors,
+        "error_rate": round(errors / len(results), 4) if results else 0.0,
+    }
@@ -1,40 +1,513 @@
-import shutil
-from os import rmdir
+from __future__ import annotations
+
+import os
+import sys
 from pathlib import Path
 
-from markdown_processing import extract_title, markdown_to_html_node
+from build_stamp import input_stamp, is_up_to_date, remove_stamp, write_stamp
+from version import GENERATOR_VERSION
+
+# Set without importing typing, which would cost the startup this module avoids.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+    import threading
+    from collections.abc import Callable
+
+    from build_cache import BuildCache
+    from rendering import PageRenderer
+    from variants import Variant
 
 ROOT_FOLDER = Path("./")
 PUBLIC_FOLDER = ROOT_FOLDER / "public"
+BUILDS_FOLDER = ROOT_FOLDER / ".builds"
+VARIANT_BUILDS_FOLDER = ROOT_FOLDER / ".variant-builds"
 STATIC_FOLDER = ROOT_FOLDER / "static"
 CONTENT_FOLDER = ROOT_FOLDER / "content"
+INCLUDES_FOLDER = ROOT_FOLDER / "includes"
 HTML_TEMPLATE = ROOT_FOLDER / "template.html"
+CACHE_FOLDER = ROOT_FOLDER / ".cache"
+METADATA_INDEX = CACHE_FOLDER / "metadata.json"
+IMAGE_INDEX = CACHE_FOLDER / "images.json"
+LINK_GRAPH = CACHE_FOLDER / "links.json"
+RENDER_STATS = CACHE_FOLDER / "render-stats.json"
+INCLUDE_RECORD = CACHE_FOLDER / "includes.json"
+RENDER_OPTIONS = CACHE_FOLDER / "render-options.json"
+PAGE_CACHE_FOLDER = CACHE_FOLDER / "pages"
+BUILD_STAMP = CACHE_FOLDER / "build-stamp"
+STAMP_INPUTS = [
+    CONTENT_FOLDER,
+    INCLUDES_FOLDER,
+    STATIC_FOLDER,
+    HTML_TEMPLATE,
+    Path(__file__).parent,
+]
+KEPT_BUILDS = 2
+LISTING_PAGE_SIZE = 10
+PAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+PIPELINE_WORKERS = {"read": 4, "render": os.cpu_count() or 1, "write": 4}
+PIPELINE_QUEUE_SIZE = 64
+PREFETCH_LIMIT = 3
+
+
+def main(
+    live_reload: bool = False,
+    cache_folder: Path | None = PAGE_CACHE_FOLDER,
+    cache_max_bytes: int = PAGE_CACHE_MAX_BYTES,
+    pipeline_workers: dict[str, int] | None = None,
+    pipeline_queue_size: int = PIPELINE_QUEUE_SIZE,
+    archive_path: Path | None = None,
+    compress_archive: bool = False,
+    fingerprint_assets: bool = False,
+    inline_css_threshold: int | None = None,
+    prefetch_limit: int = PREFETCH_LIMIT,
+    variants: list[Variant] | None = None,
+) -> None:
+    from build_cache import BuildCache, LocalDirectoryBackend
+
+    renderer = load_renderer(
+        HTML_TEMPLATE,
+        STATIC_FOLDER,
+        IMAGE_INDEX,
+        live_reload,
+        fingerprint_assets,
+        inline_css_threshold,
+        INCLUDES_FOLDER,
+    )
+    save_render_options(
+        RENDER_OPTIONS, fingerprint_assets, inline_css_threshold, prefetch_limit
+    )
+    record_includes(CONTENT_FOLDER, renderer, INCLUDE_RECORD)
+    apply_link_graph(
+        CONTENT_FOLDER,
+        STATIC_FOLDER,
+        renderer,
+        LINK_GRAPH,
+        METADATA_INDEX,
+        prefetch_limit,
+    )
+    cache = None
+    if cache_folder is not None:
+        cache = BuildCache(LocalDirectoryBackend(cache_folder), cache_max_bytes)
+    if archive_path is not None:
+        build_archive(
+            STATIC_FOLDER,
+            CONTENT_FOLDER,
+            renderer,
+            archive_path,
+            METADATA_INDEX,
+            cache,
+            compress_archive,
+        )
+    elif variants:
+        build_variants(renderer, variants, cache, live_reload, inline_css_threshold)
+    else:
+        build_folder_tree(renderer, cache, pipeline_workers, pipeline_queue_size)
+    if cache is not None:
+        cache.evict()
+        print(f"Page cache: {cache.stats()}")
+
+
+def build_folder_tree(
+    renderer: PageRenderer,
+    cache: BuildCache | None,
+    pipeline_workers: dict[str, int] | None,
+    pipeline_queue_size: int,
+) -> None:
+    from assets import copy_fingerprinted_assets
+    from pipeline import run_pipeline
+    from scheduling import RenderStats
+
+    build_folder = create_build_folder(BUILDS_FOLDER)
+    copy_folder(STATIC_FOLDER, build_folder)
+    copy_fingerprinted_assets(STATIC_FOLDER, build_folder, renderer.asset_manifest)
+    if pipeline_workers is None:
+        generate_pages_recursive(CONTENT_FOLDER, renderer, build_folder, cache)
+    else:
+        render_stats = RenderStats(RENDER_STATS)
+        report = run_pipeline(
+            collect_pages(CONTENT_FOLDER, build_folder),
+            renderer,
+            cache,
+            pipeline_workers,
+            pipeline_queue_size,
+            render_stats,
+        )
+        render_stats.save()
+        print("\n".join(report.lines()))
+    generate_listing_pages(
+        CONTENT_FOLDER, renderer.template, build_folder, PUBLIC_FOLDER, METADATA_INDEX
+    )
+    publish_folder(build_folder, PUBLIC_FOLDER)
+    prune_builds(BUILDS_FOLDER, PUBLIC_FOLDER, KEPT_BUILDS)
+
+
+def build_variants(
+    renderer: PageRenderer,
+    variants: list[Variant],
+    cache: BuildCache | None,
+    live_reload: bool = False,
+    inline_css_threshold: int | None = None,
+) -> None:
+    from assets import copy_fingerprinted_assets
+    from variants import Variant, link_files, render_variants
+
+    site = Variant("site", HTML_TEMPLATE, PUBLIC_FOLDER, BUILDS_FOLDER)
+    variants = [site, *variants]
+    renderers = [renderer] + [
+        renderer.with_template(
+            prepare_template(
+                variant.template_path,
+                STATIC_FOLDER,
+                live_reload,
+                inline_css_threshold,
+                renderer.asset_manifest,
+            )
+        )
+        for variant in variants[1:]
+    ]
+    build_folders = [create_build_folder(variant.builds_folder) for variant in variants]
+
+    copy_folder(STATIC_FOLDER, build_folders[0])
+    copy_fingerprinted_assets(STATIC_FOLDER, build_folders[0], renderer.asset_manifest)
+    static_names = [
+        file.relative_to(build_folders[0]).as_posix()
+        for file in build_folders[0].rglob("*")
+        if file.is_file()
+    ]
+    for build_folder in build_folders[1:]:
+        print(f"Linking {len(static_names)} static files into '{build_folder}'")
+        link_files(build_folders[0], build_folder, static_names)
+
+    pages = collect_pages(CONTENT_FOLDER, Path())
+    parses = render_variants(pages, renderers, build_folders, cache)
+    print(f"Parsed {parses} of {len(pages)} pages for {len(variants)} variants")
+
+    for variant, variant_renderer, build_folder in zip(
+        variants, renderers, build_folders
+    ):
+        generate_listing_pages(
+            CONTENT_FOLDER,
+            variant_renderer.template,
+            build_folder,
+            variant.public_folder,
+            METADATA_INDEX,
+        )
+        publish_folder(build_folder, variant.public_folder)
+        prune_builds(variant.builds_folder, variant.public_folder, KEPT_BUILDS)
+
+
+def build_archive(
+    dir_static: Path,
+    dir_content: Path,
+    renderer: PageRenderer,
+    archive_path: Path,
+    index_path: Path,
+    cache: BuildCache | None = None,
+    compress: bool = False,
+) -> None:
+    from archive import ArchiveWriter
+    from assets import ASSET_MANIFEST, manifest_json
+
+    entries: dict[str, tuple[str, Path | str]] = {}
+    for file in dir_static.rglob("*"):
+        if file.is_file():
+            entries[file.relative_to(dir_static).as_posix()] = ("static", file)
+    for url, fingerprinted_url in renderer.asset_manifest.items():
+        entries[fingerprinted_url.lstrip("/")] = ("static", dir_static / url[1:])
+    if renderer.asset_manifest:
+        entries[ASSET_MANIFEST] = ("manifest", manifest_json(renderer.asset_manifest))
+    for from_path, dest_path in collect_pages(dir_content, Path()):
+        entries[dest_path.as_posix()] = ("page", from_path)
+    for output_path, html in render_listing_pages(
+        dir_content, renderer.template, index_path
+    ):
+        entries[output_path] = ("listing", html)
+
+    print(f"Writing archive: '{archive_path}'")
+    with ArchiveWriter(archive_path, compress) as archive:
+        for name in sorted(entries):
+            kind, value = entries[name]
+            if kind == "static":
+                archive.add_file(name, Path(value))
+            elif kind == "page":
+                archive.add_text(name, page_html(Path(value), renderer, name, cache))
+            else:
+                archive.add_text(name, str(value))
+
+
+def load_template(template_path: Path, live_reload: bool = False) -> str:
+    from livereload import inject_live_reload
+
+    template = template_path.read_text()
+    if live_reload:
+        template = inject_live_reload(template)
+    return template
+
+
+def prepare_template(
+    template_path: Path,
+    dir_static: Path,
+    live_reload: bool = False,
+    inline_css_threshold: int | None = None,
+    manifest: dict[str, str] | None = None,
+) -> str:
+    from assets import rewrite_template_urls
+    from stylesheets import inline_stylesheets
+
+    template = load_template(template_path, live_reload)
+    if inline_css_threshold is not None:
+        template = inline_stylesheets(template, dir_static, inline_css_threshold)
+    if manifest:
+        template = rewrite_template_urls(template, manifest)
+    return template
+
+
+def load_renderer(
+    template_path: Path,
+    dir_static: Path,
+    image_index_path: Path,
+    live_reload: bool = False,
+    fingerprint_assets: bool = False,
+    inline_css_threshold: int | None = None,
+    dir_includes: Path | None = None,
+) -> PageRenderer:
+    from assets import build_asset_manifest
+    from images import ImageSizeIndex
+    from includes import IncludeLibrary
+    from rendering import PageRenderer
+
+    image_index = ImageSizeIndex(image_index_path)
+    image_sizes = image_index.scan(dir_static)
+    image_index.save()
+    manifest = build_asset_manifest(dir_static) if fingerprint_assets else {}
+    template = prepare_template(
+        template_path, dir_static, live_reload, inline_css_threshold, manifest
+    )
+    includes = IncludeLibrary(dir_includes) if dir_includes is not None else None
+    return PageRenderer(template, image_sizes, manifest, includes=includes)
+
+
+def save_render_options(
+    options_path: Path,
+    fingerprint_assets: bool,
+    inline_css_threshold: int | None,
+    prefetch_limit: int,
+) -> None:
+    import json
+
+    options = {
+        "fingerprint_assets": fingerprint_assets,
+        "inline_css_threshold": inline_css_threshold,
+        "prefetch_limit": prefetch_limit,
+    }
+    options_path.parent.mkdir(parents=True, exist_ok=True)
+    options_path.write_text(json.dumps(options, indent=1, sort_keys=True))
+
+
+def load_render_options(options_path: Path) -> dict:
+    import json
+
+    options = {
+        "fingerprint_assets": False,
+        "inline_css_threshold": None,
+        "prefetch_limit": PREFETCH_LIMIT,
+    }
+    if options_path.exists():
+        options.update(json.loads(options_path.read_text()))
+    return options
+
+
+def load_live_renderer(template_path: Path, dir_content: Path) -> PageRenderer:
+    # Live rebuilds replace published pages, so they use the last build's options.
+    options = load_render_options(RENDER_OPTIONS)
+    renderer = load_renderer(
+        template_path,
+        STATIC_FOLDER,
+        IMAGE_INDEX,
+        live_reload=True,
+        fingerprint_assets=options["fingerprint_assets"],
+        inline_css_threshold=options["inline_css_threshold"],
+        dir_includes=INCLUDES_FOLDER,
+    )
+    apply_link_graph(
+        dir_content,
+        STATIC_FOLDER,
+        renderer,
+        LINK_GRAPH,
+        METADATA_INDEX,
+        options["prefetch_limit"],
+    )
+    return renderer
+
+
+def record_includes(
+    dir_content: Path, renderer: PageRenderer, record_path: Path
+) -> dict[str, list[str]]:
+    import json
+
+    record = {}
+    for from_path, _ in collect_pages(dir_content, Path()):
+        dependencies = renderer.includes.dependencies(from_path.read_text())
+        if dependencies:
+            record[from_path.as_posix()] = dependencies
+    # Render shared fragments up front so pipeline workers receive them ready.
+    for name in sorted({name for names in record.values() for name in names}):
+        renderer.include(name)
+    if record:
+        print(
+            f"Rendered {renderer.includes.renders} include fragments"
+            f" used by {len(record)} pages"
+        )
+    record_path.parent.mkdir(parents=True, exist_ok=True)
+    record_path.write_text(json.dumps(record, sort_keys=True))
+    return record
+
+
+def load_include_record(record_path: Path) -> dict[str, list[str]]:
+    import json
+
+    if not record_path.exists():
+        return {}
+    return json.loads(record_path.read_text())
+
+
+def pages_including(record: dict[str, list[str]], names: list[str]) -> list[Path]:
+    return sorted(
+        Path(page)
+        for page, dependencies in record.items()
+        if any(name in dependencies for name in names)
+    )
+
+
+def apply_link_graph(
+    dir_content: Path,
+    dir_static: Path,
+    renderer: PageRenderer,
+    graph_path: Path,
+    index_path: Path,
+    prefetch_limit: int,
+) -> list[tuple[str, str]]:
+    from link_graph import LinkGraph, output_urls
+    from metadata_index import listing_pages, load_index, save_index, update_index
+
+    graph = LinkGraph(graph_path)
+    graph.update(dir_content)
+    graph.save()
+
+    index = load_index(index_path)
+    update_index(index, dir_content)
+    save_index(index, index_path)
+    outputs = [dest.as_posix() for _, dest in collect_pages(dir_content, Path())]
+    outputs += [
+        file.relative_to(dir_static).as_posix()
+        for file in dir_static.rglob("*")
+        if file.is_file()
+    ]
+    outputs += list(renderer.asset_manifest.values())
+    outputs += [
+        listing.output_path() for listing in listing_pages(index, LISTING_PAGE_SIZE)
+    ]
+    known_urls = output_urls(outputs)
+
+    broken_links = graph.broken_links(known_urls)
+    for source, link in broken_links:
+        print(f"Broken link in '{dir_content / source}': '{link}'")
+    if prefetch_limit > 0:
+        renderer.prefetch = {
+            dir_content / source: urls
+            for source, urls in graph.prefetch_urls(known_urls, prefetch_limit).items()
+        }
+    return broken_links
+
+
+def create_build_folder(builds_folder: Path) -> Path:
+    import time
+
+    build_folder = builds_folder / str(time.time_ns())
+    print(f"Creating build folder: '{build_folder}'")
+    build_folder.mkdir(parents=True)
+    return build_folder
 
 
-def main() -> None:
-    copy_static_to_public()
-    generate_pages_recursive(CONTENT_FOLDER, HTML_TEMPLATE, PUBLIC_FOLDER)
+def publish_folder(build_folder: Path, public_folder: Path) -> None:
+    link = public_folder.with_name(f".{public_folder.name}.tmp")
+    if link.is_symlink():
+        link.unlink()
+    try:
+        target = os.path.relpath(build_folder, public_folder.parent)
+        link.symlink_to(target, target_is_directory=True)
+    except OSError:
+        # Symlinks need extra privileges on Windows, fall back to a rename swap.
+        if public_folder.is_symlink():
+            public_folder.unlink()
+        retire_folder(public_folder, build_folder.parent)
+        print(f"Renaming folder: '{build_folder}' to '{public_folder}'")
+        build_folder.rename(public_folder)
+        return
+    retire_folder(public_folder, build_folder.parent)
+    print(f"Publishing folder: '{build_folder}' as '{public_folder}'")
+    os.replace(link, public_folder)
 
 
-def copy_static_to_public() -> None:
-    delete_folder(PUBLIC_FOLDER)
-    copy_folder(STATIC_FOLDER, PUBLIC_FOLDER)
+def retire_folder(public_folder: Path, builds_folder: Path) -> None:
+    import time
+
+    if public_folder.exists() and not public_folder.is_symlink():
+        # A fresh name keeps earlier retired builds around for rollback and pruning.
+        retired_folder = builds_folder / str(time.time_ns())
+        print(f"Moving folder: '{public_folder}' to '{retired_folder}'")
+        public_folder.rename(retired_folder)
+
+
+def rollback_public(builds_folder: Path, public_folder: Path) -> None:
+    if not public_folder.exists():
+        raise ValueError(f"Cannot roll back '{public_folder}': nothing is published")
+    current = public_folder.resolve()
+    previous = [build for build in list_builds(builds_folder) if build != current]
+    if not previous:
+        raise ValueError("No previous build to roll back to")
+    publish_folder(previous[-1], public_folder)
+
+
+def list_builds(builds_folder: Path) -> list[Path]:
+    if not builds_folder.exists():
+        return []
+    return sorted(
+        (build.resolve() for build in builds_folder.iterdir() if build.is_dir()),
+        key=lambda build: build.name,
+    )
+
+
+def prune_builds(
+    builds_folder: Path, public_folder: Path, keep: int
+) -> threading.Thread:
+    import threading
+
+    current = public_folder.resolve() if public_folder.is_symlink() else None
+    builds = [build for build in list_builds(builds_folder) if build != current]
+    stale = builds[: max(len(builds) - (keep - 1), 0)]
+    thread = threading.Thread(target=delete_folders, args=(stale,))
+    thread.start()
+    return thread
+
+
+def delete_folders(folders: list[Path]) -> None:
+    for folder in folders:
+        delete_folder(folder)
 
 
 def delete_folder(folder: Path) -> None:
+    import shutil
+
     if folder.exists():
-        for file in folder.glob("*"):
-            if file.is_file():
-                print(f"Removing file: '{file}'")
-                file.unlink()
-            else:
-                delete_folder(file)
         print(f"Removing folder: '{folder}'")
-        rmdir(folder)
-        print()
+        shutil.rmtree(folder)
 
 
 def copy_folder(source: Path, destination: Path) -> None:
+    import shutil
+
     if not destination.exists():
         destination.mkdir()
     for file in source.glob("*"):
@@ -50,35 +523,327 @@ def copy_folder(source: Path, destination: Path) -> None:
 
 
 def generate_pages_recursive(
-    dir_content: Path, template_path: Path, dest_dir: Path
+    dir_content: Path,
+    renderer: PageRenderer,
+    dest_dir: Path,
+    cache: BuildCache | None = None,
 ) -> None:
     files = dir_content.glob("*")
     for file in files:
         if file.is_file():
             if file.suffix == ".md":
                 new_file = dest_dir / (file.stem + ".html")
-                generate_page(file, template_path, new_file)
+                generate_page(file, renderer, new_file, cache)
         else:
-            generate_pages_recursive(file, template_path, dest_dir / file.name)
+            generate_pages_recursive(file, renderer, dest_dir / file.name, cache)
 
 
-def generate_page(from_path: Path, template_path: Path, dest_path: Path) -> None:
-    print(
-        f"Generating page from '{from_path}' to '{dest_path}' using '{template_path}'"
-    )
-    markdown_content = from_path.read_text()
-    template = template_path.read_text()
-    html = markdown_to_html_node(markdown_content).to_html()
-    title = extract_title(markdown_content)
+def collect_pages(dir_content: Path, dest_dir: Path) -> list[tuple[Path, Path]]:
+    pages = []
+    for file in dir_content.glob("*"):
+        if file.is_file():
+            if file.suffix == ".md":
+                pages.append((file, dest_dir / (file.stem + ".html")))
+        else:
+            pages.extend(collect_pages(file, dest_dir / file.name))
+    return pages
+
+
+def generate_page(
+    from_path: Path,
+    renderer: PageRenderer,
+    dest_path: Path,
+    cache: BuildCache | None = None,
+) -> None:
+    html = page_html(from_path, renderer, dest_path, cache)
 
     dest_folder = dest_path.parent
     if not dest_folder.exists():
         print(f"Creating folder: '{dest_folder}'")
         dest_folder.mkdir()
-    dest_path.write_text(
-        template.replace("{{ Title }}", title).replace("{{ Content }}", html)
+    dest_path.write_text(html)
+
+
+def page_html(
+    from_path: Path,
+    renderer: PageRenderer,
+    destination: Path | str,
+    cache: BuildCache | None = None,
+) -> str:
+    markdown_content = from_path.read_text()
+    prefetch_urls = renderer.prefetch_for(from_path)
+    html = None
+    if cache is not None:
+        key = renderer.cache_key(markdown_content, prefetch_urls)
+        html = cache.get(key)
+    if html is None:
+        print(f"Generating page from '{from_path}' to '{destination}'")
+        html = renderer.render(markdown_content, prefetch_urls)
+        if cache is not None:
+            cache.put(key, html)
+    else:
+        print(f"Using cached page for '{from_path}' at '{destination}'")
+    return html
+
+
+def rebuild_page(
+    from_path: Path, dir_content: Path, renderer: PageRenderer, dest_dir: Path
+) -> str:
+    from metadata_index import page_url
+
+    relative_path = from_path.relative_to(dir_content)
+    dest_path = dest_dir / relative_path.with_suffix(".html")
+    print(f"Rebuilding page from '{from_path}' to '{dest_path}'")
+    html = renderer.render(from_path.read_text(), renderer.prefetch_for(from_path))
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = dest_path.with_name(f".{dest_path.name}.tmp")
+    temporary_path.write_text(html)
+    os.replace(temporary_path, dest_path)
+    return page_url(relative_path)
+
+
+def rebuild_changed_pages(
+    sources: list[Path],
+    dir_content: Path,
+    load: Callable[[], PageRenderer],
+    dest_dir: Path,
+    record: dict[str, list[str]],
+) -> list[str]:
+    # Pages are often saved half-edited, so errors are reported and the caller
+    # keeps watching for the next change.
+    try:
+        renderer = load()
+    except Exception as error:
+        print(f"Could not load the renderer: {error}")
+        return []
+    urls = []
+    for source in sources:
+        if not source.exists():
+            continue
+        try:
+            url = rebuild_page(source, dir_content, renderer, dest_dir)
+            if renderer.includes is not None:
+                record[source.as_posix()] = renderer.includes.dependencies(
+                    source.read_text()
+                )
+        except Exception as error:
+            print(f"Could not rebuild '{source}': {error}")
+            continue
+        urls.append(url)
+    return urls
+
+
+def generate_listing_pages(
+    dir_content: Path,
+    template: str,
+    dest_dir: Path,
+    published_dir: Path,
+    index_path: Path,
+) -> None:
+    import hashlib
+    import shutil
+
+    from metadata_index import listing_pages, load_index, save_index, update_index
+    from rendering import fill_template
+
+    index = load_index(index_path)
+    update_index(index, dir_content)
+    # The version covers changes to how listings are rendered.
+    listing_inputs = f"{GENERATOR_VERSION}:{template}"
+    template_hash = hashlib.sha256(listing_inputs.encode()).hexdigest()
+
+    # Signatures are kept per published folder so variants do not evict each other.
+    signatures = {}
+    for listing in listing_pages(index, LISTING_PAGE_SIZE):
+        output_path = listing.output_path()
+        signature = f"{template_hash}:{listing.signature()}"
+        dest_path = dest_dir / output_path
+        published_path = published_dir / output_path
+        signatures[published_path.as_posix()] = signature
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        recorded = index["listings"].get(published_path.as_posix())
+        if recorded == signature and published_path.exists():
+            print(f"Reusing listing page: '{published_path}'")
+            shutil.copy(published_path, dest_path)
+        else:
+            print(f"Generating listing page: '{dest_path}'")
+            html = listing.to_html_node().to_html()
+            dest_path.write_text(fill_template(template, listing.title, html))
+
+    prefix = f"{published_dir.as_posix()}/"
+    index["listings"] = {
+        path: signature
+        for path, signature in index["listings"].items()
+        if not path.startswith(prefix)
+    } | signatures
+    save_index(index, index_path)
+
+
+def render_listing_pages(
+    dir_content: Path, template: str, index_path: Path
+) -> list[tuple[str, str]]:
+    from metadata_index import listing_pages, load_index, save_index, update_index
+    from rendering import fill_template
+
+    index = load_index(index_path)
+    update_index(index, dir_content)
+    save_index(index, index_path)
+    pages = []
+    for listing in listing_pages(index, LISTING_PAGE_SIZE):
+        html = listing.to_html_node().to_html()
+        pages.append(
+            (listing.output_path(), fill_template(template, listing.title, html))
+        )
+    return pages
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Static site generator", allow_abbrev=False
+    )
+    parser.add_argument("--version", action="version", version=GENERATOR_VERSION)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Build even when no input changed since the last build",
+    )
+    parser.add_argument(
+        "--rollback", action="store_true", help="Publish the previous build again"
+    )
+    parser.add_argument(
+        "--dev",
+        action="store_true",
+        help="Inject the live-reload client used by server.py --live-reload",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Content-addressed page cache, may be shared between machines",
+        default=PAGE_CACHE_FOLDER,
+    )
+    parser.add_argument(
+        "--cache-max-bytes",
+        type=int,
+        help="Evict least recently used cache entries above this size",
+        default=PAGE_CACHE_MAX_BYTES,
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Render every page from scratch"
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap reading, rendering and writing pages across worker pools",
+    )
+    for stage, workers in PIPELINE_WORKERS.items():
+        parser.add_argument(
+            f"--{stage}-workers",
+            type=int,
+            help=f"Workers of the pipeline {stage} stage",
+            default=workers,
+        )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        help="Capacity of the queues between pipeline stages",
+        default=PIPELINE_QUEUE_SIZE,
+    )
+    parser.add_argument(
+        "--archive",
+        type=Path,
+        help="Write the site into a .zip, .tar or .tar.gz file instead of public/",
+    )
+    parser.add_argument(
+        "--compress", action="store_true", help="Deflate text entries of a .zip"
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="Copy static files under content-hashed names and link to those",
+    )
+    parser.add_argument(
+        "--inline-css",
+        type=int,
+        metavar="BYTES",
+        help="Inline stylesheets up to this minified size, preload larger ones",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        metavar="COUNT",
+        help="Prefetch hints per page taken from the link graph, 0 disables them",
+        default=PREFETCH_LIMIT,
+    )
+    parser.add_argument(
+        "--variant",
+        nargs=3,
+        action="append",
+        metavar=("NAME", "TEMPLATE", "OUTPUT"),
+        help="Also publish the site through TEMPLATE into OUTPUT, may be repeated",
+        default=[],
+    )
+    args = parser.parse_args(argv)
+    if args.variant and (args.archive is not None or args.pipeline):
+        parser.error("--variant cannot be combined with --archive or --pipeline")
+    return args
+
+
+def stamp_inputs(argv: list[str]) -> list[str]:
+    inputs = [os.fspath(path) for path in STAMP_INPUTS]
+    for index, argument in enumerate(argv):
+        if argument == "--variant":
+            # The template is the second of the three values after --variant.
+            inputs += argv[index + 2 : index + 3]
+    return inputs
+
+
+def cli(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    # Answer the cheap cases before argparse and the build modules are imported.
+    if argv == ["--version"]:
+        print(GENERATOR_VERSION)
+        return
+    stamp = None
+    if "--rollback" not in argv:
+        stamp = input_stamp(stamp_inputs(argv), [GENERATOR_VERSION, *argv])
+        if "--force" not in argv and is_up_to_date(os.fspath(BUILD_STAMP), stamp):
+            print("Nothing changed since the last build")
+            return
+
+    args = parse_args(argv)
+
+    if args.rollback:
+        rollback_public(BUILDS_FOLDER, PUBLIC_FOLDER)
+        remove_stamp(os.fspath(BUILD_STAMP))
+        return
+    from variants import Variant
+
+    variants = [
+        Variant(name, Path(template), Path(output), VARIANT_BUILDS_FOLDER / name)
+        for name, template, output in args.variant
+    ]
+    main(
+        live_reload=args.dev,
+        cache_folder=None if args.no_cache else args.cache_dir,
+        cache_max_bytes=args.cache_max_bytes,
+        pipeline_workers=(
+            {stage: getattr(args, f"{stage}_workers") for stage in PIPELINE_WORKERS}
+            if args.pipeline
+            else None
+        ),
+        pipeline_queue_size=args.queue_size,
+        archive_path=args.archive,
+        compress_archive=args.compress,
+        fingerprint_assets=args.fingerprint,
+        inline_css_threshold=args.inline_css,
+        prefetch_limit=args.prefetch,
+        variants=variants,
     )
+    output_path = args.archive if args.archive is not None else PUBLIC_FOLDER
+    write_stamp(os.fspath(BUILD_STAMP), os.fspath(output_path), stamp)
 
 
 if __name__ == "__main__":
-    main()
+    cli()
@@ -1,8 +1,11 @@
 import re
+from collections.abc import Callable
 from enum import Enum, auto
 
-from htmlnode import ParentNode
-from textnode import TextNode, TextType, text_node_to_html_node
+from htmlnode import HTMLNode, ParentNode
+from textnode import TextNode, TextType, text_nodes_to_html_nodes
+
+INCLUDE_PATTERN = re.compile(r"\{\{ include (\S+) \}\}")
 
 
 class BlockType(Enum):
@@ -148,9 +151,7 @@ def block_to_block_type(block: str) -> BlockType:
 
 
 def markdown_block_to_html_node(tag: str, markdown: str) -> ParentNode:
-    return ParentNode(
-        tag, [text_node_to_html_node(x) for x in text_to_textnodes(markdown)]
-    )
+    return ParentNode(tag, text_nodes_to_html_nodes(text_to_textnodes(markdown)))
 
 
 def heading_to_html_node(heading: str) -> ParentNode:
@@ -183,11 +184,21 @@ def paragraph_to_htmlnode(paragraph: str) -> ParentNode:
     return markdown_block_to_html_node("p", " ".join(paragraph.split("\n")))
 
 
-def markdown_to_html_node(markdown: str) -> ParentNode:
+def include_target(block: str) -> str | None:
+    match = INCLUDE_PATTERN.fullmatch(block)
+    return match[1] if match else None
+
+
+def markdown_to_html_node(
+    markdown: str, include: Callable[[str], HTMLNode] | None = None
+) -> ParentNode:
     nodes = []
     for block in markdown_to_blocks(markdown):
+        target = include_target(block) if include is not None else None
         block_type = block_to_block_type(block)
-        if block_type is BlockType.HEADING:
+        if target is not None:
+            nodes.append(include(target))
+        elif block_type is BlockType.HEADING:
             nodes.append(heading_to_html_node(block))
         elif block_type is BlockType.CODE:
             nodes.append(code_to_html_node(block))
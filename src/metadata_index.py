@@ -0,0 +1,190 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from frontmatter import read_page_metadata
+from htmlnode import HTMLNode, LeafNode, ParentNode, escape_text
+
+INDEX_VERSION = 1
+ARCHIVE_FOLDER = "archive"
+TAGS_FOLDER = "tags"
+
+PageEntry = dict[str, str | int | list[str]]
+
+
+def page_url(relative_path: Path) -> str:
+    parts = list(relative_path.with_suffix("").parts)
+    if parts[-1] == "index":
+        return "/" + "".join(f"{part}/" for part in parts[:-1])
+    return "/" + "/".join(parts) + ".html"
+
+
+def tag_slug(tag: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", tag.lower()).strip("-")
+
+
+def tag_slugs(tags: list[str]) -> dict[str, str]:
+    plain = {tag: tag_slug(tag) for tag in tags}
+    counts: dict[str, int] = {}
+    for slug in plain.values():
+        counts[slug] = counts.get(slug, 0) + 1
+    slugs = {}
+    for tag, slug in plain.items():
+        if not slug or counts[slug] > 1:
+            # Tags like "C" and "C++", or ones without ASCII letters, share a slug.
+            digest = hashlib.sha256(tag.encode()).hexdigest()[:8]
+            slug = f"{slug}-{digest}" if slug else digest
+        slugs[tag] = slug
+    if len(set(slugs.values())) != len(slugs):
+        raise ValueError(f"Tags map to the same listing folder: {sorted(slugs)}")
+    return slugs
+
+
+def load_index(index_path: Path) -> dict:
+    if index_path.exists():
+        index = json.loads(index_path.read_text())
+        if index.get("version") == INDEX_VERSION:
+            return index
+    return {"version": INDEX_VERSION, "pages": {}, "orderings": {}, "listings": {}}
+
+
+def save_index(index: dict, index_path: Path) -> None:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    index_path.write_text(json.dumps(index, indent=1, sort_keys=True))
+
+
+def update_index(index: dict, content_folder: Path) -> bool:
+    pages = {}
+    changed = False
+    for file in sorted(content_folder.rglob("*.md")):
+        if not file.is_file():
+            # Dangling links such as editor lock files are not pages.
+            continue
+        relative_path = file.relative_to(content_folder).as_posix()
+        stat = file.stat()
+        entry = index["pages"].get(relative_path)
+        if (
+            entry is None
+            or entry["mtime_ns"] != stat.st_mtime_ns
+            or entry["size"] != stat.st_size
+        ):
+            print(f"Indexing metadata: '{file}'")
+            entry = page_entry(file, Path(relative_path))
+            entry["mtime_ns"] = stat.st_mtime_ns
+            entry["size"] = stat.st_size
+            changed = True
+        pages[relative_path] = entry
+    changed = changed or pages.keys() != index["pages"].keys()
+    index["pages"] = pages
+    if changed or not index["orderings"]:
+        index["orderings"] = compute_orderings(pages)
+    return changed
+
+
+def page_entry(file: Path, relative_path: Path) -> PageEntry:
+    metadata = read_page_metadata(file)
+    tags = metadata.get("tags", [])
+    return {
+        "url": page_url(relative_path),
+        "title": str(metadata.get("title", relative_path.stem)),
+        "date": str(metadata.get("date", "")),
+        "tags": [tags] if isinstance(tags, str) else tags,
+    }
+
+
+def compute_orderings(pages: dict[str, PageEntry]) -> dict:
+    dated = [path for path, entry in pages.items() if entry["date"]]
+    by_date = sorted(
+        sorted(dated, key=lambda path: pages[path]["title"]),
+        key=lambda path: pages[path]["date"],
+        reverse=True,
+    )
+    by_tag: dict[str, list[str]] = {}
+    for path in by_date:
+        for tag in pages[path]["tags"]:
+            by_tag.setdefault(tag, []).append(path)
+    return {"date": by_date, "tags": by_tag}
+
+
+class Listing:
+    def __init__(
+        self,
+        title: str,
+        folder: str,
+        number: int,
+        page_count: int,
+        entries: list[PageEntry],
+    ) -> None:
+        self.title = title
+        self.folder = folder
+        self.number = number
+        self.page_count = page_count
+        self.entries = entries
+
+    def output_path(self) -> str:
+        return f"{self.folder}/{self.page_path(self.number)}index.html"
+
+    def page_path(self, number: int) -> str:
+        return "" if number == 1 else f"page/{number}/"
+
+    def signature(self) -> str:
+        fields = [(e["url"], e["title"], e["date"], e["tags"]) for e in self.entries]
+        data = json.dumps([self.title, self.number, self.page_count, fields])
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def to_html_node(self) -> ParentNode:
+        items = []
+        for entry in self.entries:
+            title = escape_text(str(entry["title"]))
+            children: list[HTMLNode] = [
+                LeafNode("a", title, {"href": str(entry["url"])})
+            ]
+            if entry["date"]:
+                children.append(LeafNode(None, f" ({escape_text(str(entry['date']))})"))
+            items.append(ParentNode("li", children))
+        nodes: list[HTMLNode] = [
+            LeafNode("h1", escape_text(self.title)),
+            ParentNode("ul", items),
+        ]
+        links = []
+        if self.number > 1:
+            href = f"/{self.folder}/{self.page_path(self.number - 1)}"
+            links.append(LeafNode("a", "Newer", {"href": href}))
+        if self.number < self.page_count:
+            href = f"/{self.folder}/{self.page_path(self.number + 1)}"
+            links.append(LeafNode("a", "Older", {"href": href}))
+        if links:
+            nodes.append(ParentNode("p", links))
+        return ParentNode("div", nodes)
+
+
+def listing_pages(index: dict, page_size: int) -> list[Listing]:
+    pages = index["pages"]
+    orderings = index["orderings"]
+    listings = paginate("Archive", ARCHIVE_FOLDER, orderings["date"], pages, page_size)
+    slugs = tag_slugs(list(orderings["tags"]))
+    for tag, paths in sorted(orderings["tags"].items()):
+        folder = f"{TAGS_FOLDER}/{slugs[tag]}"
+        listings += paginate(f"Tag: {tag}", folder, paths, pages, page_size)
+    return listings
+
+
+def paginate(
+    title: str,
+    folder: str,
+    paths: list[str],
+    pages: dict[str, PageEntry],
+    page_size: int,
+) -> list[Listing]:
+    page_count = (len(paths) + page_size - 1) // page_size
+    return [
+        Listing(
+            title,
+            folder,
+            number,
+            page_count,
+            [pages[path] for path in paths[(number - 1) * page_size :][:page_size]],
+        )
+        for number in range(1, page_count + 1)
+    ]
@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from images import ImageSizeIndex
+from includes import IncludeLibrary
+from rendering import PageRenderer
+
+
+class PageCache:
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries: OrderedDict[Path, tuple[tuple[int, ...], bytes]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Path, version: tuple[int, ...]) -> bytes | None:
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Path, version: tuple[int, ...], html: bytes) -> None:
+        self.discard(key)
+        if len(html) > self.max_bytes:
+            return
+        self.entries[key] = (version, html)
+        self.size += len(html)
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def discard(self, key: Path) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+
+class OnDemandRenderer:
+    def __init__(
+        self,
+        content_folder: Path,
+        template_path: Path,
+        max_bytes: int,
+        includes_folder: Path | None = None,
+        static_folder: Path | None = None,
+        image_index: ImageSizeIndex | None = None,
+    ):
+        self.content_folder = content_folder.resolve()
+        self.template_path = template_path
+        self.includes_folder = includes_folder
+        self.static_folder = static_folder
+        self.image_index = image_index
+        self.cache = PageCache(max_bytes)
+        self.dependencies: dict[Path, list[str]] = {}
+        self.lock = threading.Lock()
+
+    def source_for(self, url_path: str) -> Path | None:
+        relative_path = url_path.lstrip("/")
+        if relative_path == "" or relative_path.endswith("/"):
+            candidate = self.content_folder / relative_path / "index.md"
+        elif relative_path.endswith(".html"):
+            candidate = self.content_folder / (relative_path[: -len(".html")] + ".md")
+        else:
+            return None
+        candidate = candidate.resolve()
+        if not candidate.is_relative_to(self.content_folder) or not candidate.is_file():
+            return None
+        return candidate
+
+    def needs_trailing_slash(self, url_path: str) -> bool:
+        if url_path.endswith("/") or url_path.endswith(".html"):
+            return False
+        return self.source_for(url_path + "/") is not None
+
+    def include_mtimes(self, names: list[str]) -> tuple[int, ...]:
+        mtimes = []
+        for name in names:
+            path = self.includes_folder / name
+            mtimes.append(path.stat().st_mtime_ns if path.exists() else -1)
+        return tuple(mtimes)
+
+    def render(self, url_path: str) -> bytes | None:
+        source = self.source_for(url_path)
+        if source is None:
+            return None
+        page_version = (
+            source.stat().st_mtime_ns,
+            self.template_path.stat().st_mtime_ns,
+        )
+        with self.lock:
+            names = self.dependencies.get(source, [])
+        # Included snippets are part of the page, so editing one invalidates it too.
+        version = page_version + self.include_mtimes(names)
+        with self.lock:
+            html = self.cache.get(source, version)
+            if html is not None:
+                return html
+        print(f"Rendering page on demand: '{source}'")
+        markdown_content = source.read_text()
+        includes = None
+        names = []
+        if self.includes_folder is not None:
+            includes = IncludeLibrary(self.includes_folder)
+            names = includes.dependencies(markdown_content)
+            version = page_version + self.include_mtimes(names)
+        image_sizes = {}
+        if self.static_folder is not None and self.image_index is not None:
+            with self.lock:
+                image_sizes = self.image_index.scan(self.static_folder)
+        renderer = PageRenderer(
+            self.template_path.read_text(), image_sizes, includes=includes
+        )
+        html = renderer.render(markdown_content).encode()
+        with self.lock:
+            self.dependencies[source] = names
+            self.cache.put(source, version, html)
+        return html
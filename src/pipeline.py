@@ -0,0 +1,225 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from build_cache import BuildCache
+from rendering import PageRenderer
+from scheduling import RenderStats, simulate_makespan
+
+STOP = None
+
+worker_renderer: PageRenderer | None = None
+
+
+def install_worker_renderer(renderer: PageRenderer) -> None:
+    global worker_renderer
+    worker_renderer = renderer
+
+
+def render_in_worker(
+    markdown_content: str, prefetch_urls: list[str]
+) -> tuple[str, float]:
+    start = time.perf_counter()
+    html = worker_renderer.render(markdown_content, prefetch_urls)
+    return html, time.perf_counter() - start
+
+
+class StageStats:
+    def __init__(self, name: str, workers: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy_seconds = 0.0
+
+    def utilization(self, wall_seconds: float) -> float:
+        if wall_seconds <= 0:
+            return 0.0
+        return self.busy_seconds / (wall_seconds * self.workers)
+
+    def __repr__(self) -> str:
+        return f"StageStats({self.name}, {self.workers}, {self.items})"
+
+
+class PipelineReport:
+    def __init__(
+        self,
+        stages: list[StageStats],
+        wall_seconds: float,
+        makespans: tuple[float, float] | None = None,
+    ) -> None:
+        self.stages = stages
+        self.wall_seconds = wall_seconds
+        self.makespans = makespans
+
+    def lines(self) -> list[str]:
+        lines = [f"Pipeline build took {self.wall_seconds:.3f}s"]
+        for stage in self.stages:
+            lines.append(
+                f"  {stage.name:<7} workers={stage.workers:<3} items={stage.items:<6}"
+                f" busy={stage.busy_seconds:.3f}s"
+                f" utilization={stage.utilization(self.wall_seconds):.0%}"
+            )
+        if self.makespans is not None:
+            naive, scheduled = self.makespans
+            improvement = 1 - scheduled / naive if naive > 0 else 0.0
+            lines.append(
+                f"  render makespan: directory order={naive:.3f}s"
+                f" scheduled={scheduled:.3f}s ({improvement:.0%} shorter)"
+            )
+        return lines
+
+
+def write_page(dest_path: Path, html: str) -> None:
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    dest_path.write_text(html)
+
+
+async def run_stage(
+    stats: StageStats,
+    source: asyncio.Queue,
+    target: asyncio.Queue | None,
+    work: Callable,
+) -> None:
+    while True:
+        item = await source.get()
+        if item is STOP:
+            return
+        start = time.perf_counter()
+        result = await work(item)
+        stats.busy_seconds += time.perf_counter() - start
+        stats.items += 1
+        if target is not None:
+            await target.put(result)
+
+
+async def run_stages(
+    pages: list[tuple[Path, Path]],
+    renderer: PageRenderer,
+    cache: BuildCache | None,
+    io_pool: Executor,
+    cpu_pool: Executor,
+    workers: dict[str, int],
+    queue_size: int,
+    render_seconds: dict[Path, float],
+) -> list[StageStats]:
+    loop = asyncio.get_running_loop()
+    read_queue: asyncio.Queue = asyncio.Queue(queue_size)
+    render_queue: asyncio.Queue = asyncio.Queue(queue_size)
+    write_queue: asyncio.Queue = asyncio.Queue(queue_size)
+    stats = {name: StageStats(name, count) for name, count in workers.items()}
+
+    async def read(item: tuple[Path, Path]) -> tuple[Path, Path, str]:
+        from_path, dest_path = item
+        return (
+            from_path,
+            dest_path,
+            await loop.run_in_executor(io_pool, from_path.read_text),
+        )
+
+    async def render_item(item: tuple[Path, Path, str]) -> tuple[Path, str]:
+        from_path, dest_path, markdown_content = item
+        prefetch_urls = renderer.prefetch_for(from_path)
+        html = None
+        if cache is not None:
+            key = renderer.cache_key(markdown_content, prefetch_urls)
+            html = await loop.run_in_executor(io_pool, cache.get, key)
+        if html is None:
+            print(f"Generating page from '{from_path}' to '{dest_path}'")
+            html, render_seconds[from_path] = await loop.run_in_executor(
+                cpu_pool, render_in_worker, markdown_content, prefetch_urls
+            )
+            if cache is not None:
+                await loop.run_in_executor(io_pool, cache.put, key, html)
+        else:
+            print(f"Using cached page for '{from_path}' at '{dest_path}'")
+        return dest_path, html
+
+    async def write(item: tuple[Path, str]) -> None:
+        await loop.run_in_executor(io_pool, write_page, *item)
+
+    async def feed() -> None:
+        for page in pages:
+            await read_queue.put(page)
+        for _ in range(workers["read"]):
+            await read_queue.put(STOP)
+
+    async def drain(
+        tasks: list[asyncio.Task], target: asyncio.Queue, count: int
+    ) -> None:
+        await asyncio.gather(*tasks)
+        for _ in range(count):
+            await target.put(STOP)
+
+    async with asyncio.TaskGroup() as group:
+        group.create_task(feed())
+        readers = [
+            group.create_task(run_stage(stats["read"], read_queue, render_queue, read))
+            for _ in range(workers["read"])
+        ]
+        renderers = [
+            group.create_task(
+                run_stage(stats["render"], render_queue, write_queue, render_item)
+            )
+            for _ in range(workers["render"])
+        ]
+        writers = [
+            group.create_task(run_stage(stats["write"], write_queue, None, write))
+            for _ in range(workers["write"])
+        ]
+        group.create_task(drain(readers, render_queue, workers["render"]))
+        group.create_task(drain(renderers, write_queue, workers["write"]))
+        await asyncio.gather(*writers)
+    return list(stats.values())
+
+
+def run_pipeline(
+    pages: list[tuple[Path, Path]],
+    renderer: PageRenderer,
+    cache: BuildCache | None,
+    workers: dict[str, int],
+    queue_size: int,
+    render_stats: RenderStats | None = None,
+) -> PipelineReport:
+    start = time.perf_counter()
+    ordered_pages = pages
+    if render_stats is not None:
+        # Longest expected render first, so big pages do not straggle at the end.
+        ordered_pages = render_stats.schedule(pages)
+    render_seconds: dict[Path, float] = {}
+    io_workers = workers["read"] + workers["write"]
+    # Ship the renderer to each worker process once instead of with every page.
+    cpu_pool = ProcessPoolExecutor(
+        workers["render"],
+        initializer=install_worker_renderer,
+        initargs=(renderer,),
+    )
+    with ThreadPoolExecutor(io_workers) as io_pool, cpu_pool:
+        stages = asyncio.run(
+            run_stages(
+                ordered_pages,
+                renderer,
+                cache,
+                io_pool,
+                cpu_pool,
+                workers,
+                queue_size,
+                render_seconds,
+            )
+        )
+    wall_seconds = time.perf_counter() - start
+    if render_stats is None:
+        return PipelineReport(stages, wall_seconds)
+
+    for from_path, seconds in render_seconds.items():
+        render_stats.record(from_path, seconds, from_path.stat().st_size)
+    render_stats.prune([from_path for from_path, _ in pages])
+    makespans = tuple(
+        simulate_makespan(
+            [render_seconds.get(from_path, 0.0) for from_path, _ in order],
+            workers["render"],
+        )
+        for order in (pages, ordered_pages)
+    )
+    return PipelineReport(stages, wall_seconds, makespans)
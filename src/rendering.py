@@ -0,0 +1,141 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+from assets import rewrite_asset_urls
+from build_cache import cache_key
+from frontmatter import split_front_matter
+from htmlnode import HTMLNode, LeafNode, ParentNode, escape_text
+from images import ImageSize, add_image_attributes
+from includes import IncludeLibrary
+from link_graph import prefetch_tags
+from markdown_processing import extract_title, markdown_to_html_node
+from version import GENERATOR_VERSION
+
+# The title and body HTML of a page, ready to be placed into any template.
+Document = tuple[str, str]
+
+
+class PageRenderer:
+    def __init__(
+        self,
+        template: str,
+        image_sizes: dict[str, ImageSize] | None = None,
+        asset_manifest: dict[str, str] | None = None,
+        prefetch: dict[Path, list[str]] | None = None,
+        includes: IncludeLibrary | None = None,
+    ) -> None:
+        self.template = template
+        self.image_sizes = image_sizes if image_sizes is not None else {}
+        self.asset_manifest = asset_manifest if asset_manifest is not None else {}
+        self.prefetch = prefetch if prefetch is not None else {}
+        self.includes = includes
+        self.fingerprint = cache_key(
+            GENERATOR_VERSION,
+            template,
+            json.dumps(sorted(self.image_sizes.items())),
+            json.dumps(sorted(self.asset_manifest.items())),
+        )
+
+    def prefetch_for(self, from_path: Path) -> list[str]:
+        return self.prefetch.get(from_path, [])
+
+    def render(
+        self, markdown_content: str, prefetch_urls: list[str] | None = None
+    ) -> str:
+        return self.fill(self.render_document(markdown_content), prefetch_urls)
+
+    def render_document(self, markdown_content: str) -> Document:
+        return render_document(
+            markdown_content,
+            self.image_sizes,
+            self.asset_manifest,
+            self.include if self.includes is not None else None,
+        )
+
+    def fill(self, document: Document, prefetch_urls: list[str] | None = None) -> str:
+        return fill_page(self.template, document, prefetch_urls)
+
+    def with_template(self, template: str) -> "PageRenderer":
+        return PageRenderer(
+            template,
+            self.image_sizes,
+            self.asset_manifest,
+            self.prefetch,
+            self.includes,
+        )
+
+    def include(self, name: str) -> HTMLNode:
+        # Each snippet is parsed once, later pages reuse its rendered HTML.
+        return LeafNode(None, self.includes.fragment(name, self.render_fragment))
+
+    def render_fragment(self, markdown_content: str) -> str:
+        node = render_body(
+            markdown_content, self.image_sizes, self.asset_manifest, self.include
+        )
+        return "".join(child.to_html() for child in node.children)
+
+    def cache_key(
+        self, markdown_content: str, prefetch_urls: list[str] | None = None
+    ) -> str:
+        include_digests = []
+        if self.includes is not None:
+            include_digests = self.includes.digests(markdown_content)
+        return cache_key(
+            self.fingerprint,
+            markdown_content,
+            *(prefetch_urls or []),
+            *include_digests,
+        )
+
+
+def render_page(
+    markdown_content: str,
+    template: str,
+    image_sizes: dict[str, ImageSize] | None = None,
+    asset_manifest: dict[str, str] | None = None,
+    prefetch_urls: list[str] | None = None,
+    include: Callable[[str], HTMLNode] | None = None,
+) -> str:
+    document = render_document(markdown_content, image_sizes, asset_manifest, include)
+    return fill_page(template, document, prefetch_urls)
+
+
+def render_document(
+    markdown_content: str,
+    image_sizes: dict[str, ImageSize] | None = None,
+    asset_manifest: dict[str, str] | None = None,
+    include: Callable[[str], HTMLNode] | None = None,
+) -> Document:
+    metadata, markdown_content = split_front_matter(markdown_content)
+    node = render_body(markdown_content, image_sizes, asset_manifest, include)
+    title = metadata.get("title") or extract_title(markdown_content)
+    return str(title), node.to_html()
+
+
+def fill_page(
+    template: str, document: Document, prefetch_urls: list[str] | None = None
+) -> str:
+    title, html = document
+    if prefetch_urls:
+        template = template.replace("</head>", f"{prefetch_tags(prefetch_urls)}</head>")
+    return fill_template(template, title, html)
+
+
+def render_body(
+    markdown_content: str,
+    image_sizes: dict[str, ImageSize] | None = None,
+    asset_manifest: dict[str, str] | None = None,
+    include: Callable[[str], HTMLNode] | None = None,
+) -> ParentNode:
+    node = markdown_to_html_node(markdown_content, include)
+    add_image_attributes(node, image_sizes if image_sizes is not None else {})
+    if asset_manifest:
+        rewrite_asset_urls(node, asset_manifest)
+    return node
+
+
+def fill_template(template: str, title: str, html: str) -> str:
+    return template.replace("{{ Title }}", escape_text(title)).replace(
+        "{{ Content }}", html
+    )
@@ -0,0 +1,61 @@
+import heapq
+import json
+from pathlib import Path
+
+STATS_VERSION = 1
+
+
+def simulate_makespan(costs: list[float], workers: int) -> float:
+    finish_times = [0.0] * max(workers, 1)
+    for cost in costs:
+        # Each page goes to whichever worker frees up first, like a pool queue.
+        heapq.heapreplace(finish_times, finish_times[0] + cost)
+    return max(finish_times)
+
+
+class RenderStats:
+    def __init__(self, stats_path: Path) -> None:
+        self.stats_path = stats_path
+        self.pages: dict[str, dict] = {}
+        if stats_path.exists():
+            data = json.loads(stats_path.read_text())
+            if data.get("version") == STATS_VERSION:
+                self.pages = data["pages"]
+
+    def save(self) -> None:
+        self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+        self.stats_path.write_text(
+            json.dumps({"version": STATS_VERSION, "pages": self.pages}, sort_keys=True)
+        )
+
+    def record(self, from_path: Path, seconds: float, size: int) -> None:
+        self.pages[from_path.as_posix()] = {"seconds": seconds, "size": size}
+
+    def prune(self, from_paths: list[Path]) -> None:
+        names = {from_path.as_posix() for from_path in from_paths}
+        self.pages = {name: page for name, page in self.pages.items() if name in names}
+
+    def seconds_per_byte(self) -> float | None:
+        total_size = sum(page["size"] for page in self.pages.values())
+        if total_size == 0:
+            return None
+        return sum(page["seconds"] for page in self.pages.values()) / total_size
+
+    def estimates(self, from_paths: list[Path]) -> dict[Path, float]:
+        rate = self.seconds_per_byte()
+        estimates = {}
+        for from_path in from_paths:
+            page = self.pages.get(from_path.as_posix())
+            size = from_path.stat().st_size
+            if page is not None and page["size"] == size:
+                estimates[from_path] = page["seconds"]
+            elif rate is not None:
+                estimates[from_path] = size * rate
+            else:
+                # Without any timings, only the relative order of sizes matters.
+                estimates[from_path] = float(size)
+        return estimates
+
+    def schedule(self, pages: list[tuple[Path, Path]]) -> list[tuple[Path, Path]]:
+        estimates = self.estimates([from_path for from_path, _ in pages])
+        return sorted(pages, key=lambda page: -estimates[page[0]])
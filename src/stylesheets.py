@@ -0,0 +1,57 @@
+import posixpath
+import re
+from pathlib import Path
+
+LINK_PATTERN = re.compile(r"<link\b[^>]*>")
+ATTRIBUTE_PATTERN = re.compile(r'([\w-]+)="([^"]*)"')
+COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+PUNCTUATION_PATTERN = re.compile(r"\s*([{};,>])\s*")
+COLON_PATTERN = re.compile(r":\s+")
+URL_PATTERN = re.compile(r"url\(\s*(['\"]?)([^'\")]+)\1\s*\)")
+INLINED_LINK_ATTRIBUTES = {"rel", "href", "media"}
+
+
+def minify_css(css: str) -> str:
+    css = COMMENT_PATTERN.sub("", css)
+    css = WHITESPACE_PATTERN.sub(" ", css)
+    css = PUNCTUATION_PATTERN.sub(r"\1", css)
+    css = COLON_PATTERN.sub(":", css)
+    return css.replace(";}", "}").strip()
+
+
+def absolutize_css_urls(css: str, stylesheet_url: str) -> str:
+    base = posixpath.dirname(stylesheet_url)
+
+    def replace(match: re.Match) -> str:
+        quote, url = match[1], match[2]
+        if url.startswith(("/", "#", "data:")) or "://" in url:
+            return match[0]
+        return f"url({quote}{posixpath.normpath(posixpath.join(base, url))}{quote})"
+
+    return URL_PATTERN.sub(replace, css)
+
+
+def inline_stylesheets(template: str, dir_static: Path, threshold: int) -> str:
+    def replace(match: re.Match) -> str:
+        attributes = dict(ATTRIBUTE_PATTERN.findall(match[0]))
+        href = attributes.get("href", "")
+        if attributes.get("rel") != "stylesheet" or not href.startswith("/"):
+            return match[0]
+        if href.startswith("//"):
+            # Protocol-relative URLs point at another host.
+            return match[0]
+        if not attributes.keys() <= INLINED_LINK_ATTRIBUTES:
+            # Attributes such as integrity or title have no <style> equivalent.
+            return match[0]
+        media = f' media="{attributes["media"]}"' if "media" in attributes else ""
+        path = dir_static / href.lstrip("/")
+        if not path.is_file():
+            return match[0]
+        css = absolutize_css_urls(minify_css(path.read_text()), href)
+        if len(css.encode()) <= threshold:
+            print(f"Inlining stylesheet: '{path}' ({len(css)} bytes)")
+            return f"<style{media}>{css}</style>"
+        return f'<link rel="preload" href="{href}" as="style"{media}>{match[0]}'
+
+    return LINK_PATTERN.sub(replace, template)
@@ -0,0 +1,71 @@
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from archive import ArchiveIndex, ArchiveWriter, archive_format
+
+
+class TestArchiveFormat(unittest.TestCase):
+    def test_formats(self):
+        self.assertEqual(archive_format(Path("site.zip")), "zip")
+        self.assertEqual(archive_format(Path("site.tar")), "tar")
+        self.assertEqual(archive_format(Path("site.tar.gz")), "tar.gz")
+        self.assertEqual(archive_format(Path("site.tgz")), "tar.gz")
+
+    def test_unsupported(self):
+        self.assertRaises(ValueError, archive_format, Path("site.rar"))
+
+
+class TestArchiveWriter(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+
+    def write(self, name: str, compress: bool = False) -> Path:
+        path = self.root / name
+        with ArchiveWriter(path, compress) as archive:
+            archive.add_text("index.html", "<h1>Home</h1>")
+            archive.add_bytes("logo.png", b"\x89PNG")
+            archive.add_text("majesty/index.html", "<h1>Majesty</h1>")
+        return path
+
+    def test_deterministic(self):
+        for name in ("a.zip", "a.tar", "a.tar.gz"):
+            first = self.write(name).read_bytes()
+            self.assertEqual(first, self.write(name).read_bytes())
+
+    def test_zip_compression_per_file(self):
+        with zipfile.ZipFile(self.write("site.zip", compress=True)) as archive:
+            types = {info.filename: info.compress_type for info in archive.infolist()}
+        self.assertEqual(types["index.html"], zipfile.ZIP_DEFLATED)
+        self.assertEqual(types["logo.png"], zipfile.ZIP_STORED)
+
+    def test_tar_timestamps(self):
+        with tarfile.open(self.write("site.tar")) as archive:
+            self.assertEqual({m.mtime for m in archive}, {315532800})
+
+    def test_requires_order(self):
+        with self.assertRaises(ValueError):
+            with ArchiveWriter(self.root / "site.zip") as archive:
+                archive.add_text("b.html", "")
+                archive.add_text("a.html", "")
+        self.assertFalse((self.root / "site.zip").exists())
+
+
+class TestArchiveIndex(unittest.TestCase):
+    def test_read(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("site.zip", "site.tar", "site.tar.gz"):
+                path = Path(directory) / name
+                with ArchiveWriter(path) as archive:
+                    archive.add_text("index.html", "<h1>Home</h1>")
+                    archive.add_text("majesty/index.html", "<h1>Majesty</h1>")
+                with ArchiveIndex(path) as index:
+                    self.assertIn("majesty/index.html", index)
+                    self.assertEqual(index.read("index.html"), b"<h1>Home</h1>")
+                    self.assertIsNone(index.read("missing.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
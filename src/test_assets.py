@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from assets import (
+    ASSET_MANIFEST,
+    ManifestIndex,
+    build_asset_manifest,
+    copy_fingerprinted_assets,
+    fingerprint_path,
+    fingerprinted_urls,
+    rewrite_asset_urls,
+    rewrite_template_urls,
+)
+from htmlnode import LeafNode, ParentNode
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_fingerprint_path(self):
+        self.assertEqual(
+            fingerprint_path("images/a.png", "0123456789abcdef"),
+            "images/a.0123456789.png",
+        )
+
+    def test_fingerprinted_urls(self):
+        manifest = '{"/images/a.png": "/images/a.0123456789.png"}'
+        self.assertEqual(
+            fingerprinted_urls(manifest), frozenset({"/images/a.0123456789.png"})
+        )
+        self.assertEqual(fingerprinted_urls(None), frozenset())
+
+
+class TestAssetManifest(unittest.TestCase):
+    def test_build_and_copy(self):
+        with tempfile.TemporaryDirectory() as directory, redirect_stdout(StringIO()):
+            static = Path(directory) / "static"
+            (static / "images").mkdir(parents=True)
+            (static / "index.css").write_text("body {}")
+            (static / "images" / "a.png").write_bytes(b"png")
+            manifest = build_asset_manifest(static)
+            self.assertEqual(
+                manifest,
+                {
+                    "/images/a.png": "/images/a.8f8cbb7dcf.png",
+                    "/index.css": "/index.62368a1a29.css",
+                },
+            )
+            public = Path(directory) / "public"
+            copy_fingerprinted_assets(static, public, manifest)
+            self.assertEqual((public / "index.62368a1a29.css").read_text(), "body {}")
+            self.assertEqual(
+                ManifestIndex().urls(public / ASSET_MANIFEST),
+                frozenset(manifest.values()),
+            )
+
+    def test_manifest_index_follows_rebuilds(self):
+        with tempfile.TemporaryDirectory() as directory, redirect_stdout(StringIO()):
+            manifests = ManifestIndex()
+            public = Path(directory)
+            manifest_path = public / ASSET_MANIFEST
+            self.assertEqual(manifests.urls(manifest_path), frozenset())
+            copy_fingerprinted_assets(public, public, {})
+            self.assertFalse(manifest_path.exists())
+            manifest_path.write_text('{"/a.css": "/a.0123456789.css"}')
+            self.assertEqual(manifests.urls(manifest_path), {"/a.0123456789.css"})
+            rebuilt_path = public / "rebuilt.json"
+            rebuilt_path.write_text('{"/b.css": "/b.0123456789.css"}')
+            os.replace(rebuilt_path, manifest_path)
+            self.assertEqual(manifests.urls(manifest_path), {"/b.0123456789.css"})
+
+
+class TestRewrite(unittest.TestCase):
+    manifest = {"/index.css": "/index.0123456789.css", "/a.png": "/a.9876543210.png"}
+
+    def test_rewrite_template_urls(self):
+        template = '<link href="/index.css" rel="stylesheet"><a href="/other.css">'
+        self.assertEqual(
+            rewrite_template_urls(template, self.manifest),
+            '<link href="/index.0123456789.css" rel="stylesheet"><a href="/other.css">',
+        )
+
+    def test_rewrite_asset_urls(self):
+        node = ParentNode(
+            "p",
+            [
+                LeafNode("img", "", {"src": "/a.png", "alt": ""}),
+                LeafNode("a", "CSS", {"href": "/index.css"}),
+                LeafNode("a", "Home", {"href": "/"}),
+            ],
+        )
+        rewrite_asset_urls(node, self.manifest)
+        self.assertEqual(
+            node.to_html(),
+            '<p><img src="/a.9876543210.png" alt=""></img>'
+            '<a href="/index.0123456789.css">CSS</a><a href="/">Home</a></p>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from build_cache import BuildCache, CacheBackend, LocalDirectoryBackend, cache_key
+
+
+class TestCacheKey(unittest.TestCase):
+    def test_same_inputs(self):
+        self.assertEqual(cache_key("1", "md", "tpl"), cache_key("1", "md", "tpl"))
+
+    def test_part_boundaries(self):
+        self.assertNotEqual(cache_key("1", "mdt", "pl"), cache_key("1", "md", "tpl"))
+
+    def test_version(self):
+        self.assertNotEqual(cache_key("1", "md", "tpl"), cache_key("2", "md", "tpl"))
+
+
+class TestCacheBackend(unittest.TestCase):
+    def test_not_implemented(self):
+        self.assertRaises(NotImplementedError, CacheBackend().get, "key")
+
+
+class TestBuildCache(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.backend = LocalDirectoryBackend(self.root)
+        self.enterContext(redirect_stdout(StringIO()))
+
+    def test_miss_then_hit(self):
+        cache = BuildCache(self.backend, 1000)
+        self.assertIsNone(cache.get("ab12"))
+        cache.put("ab12", "<p>html</p>")
+        self.assertEqual(cache.get("ab12"), "<p>html</p>")
+        self.assertEqual(
+            cache.stats(),
+            {
+                "hits": 1,
+                "misses": 1,
+                "hit_rate": 0.5,
+                "corrupt": 0,
+                "stores": 1,
+                "evictions": 0,
+            },
+        )
+
+    def test_hit_survives_failed_utime(self):
+        self.backend.put("ab12", b"html")
+        for error in (FileNotFoundError, PermissionError):
+            with mock.patch("os.utime", side_effect=error):
+                self.assertEqual(self.backend.get("ab12"), b"html")
+
+    def test_shared_between_caches(self):
+        BuildCache(self.backend, 1000).put("ab12", "html")
+        other = BuildCache(LocalDirectoryBackend(self.root), 1000)
+        self.assertEqual(other.get("ab12"), "html")
+
+    def test_corrupt_entry(self):
+        cache = BuildCache(self.backend, 1000)
+        cache.put("ab12", "html")
+        path = self.backend.path("ab12")
+        path.write_bytes(path.read_bytes().replace(b"html", b"evil"))
+        self.assertIsNone(cache.get("ab12"))
+        self.assertEqual(cache.corrupt, 1)
+        self.assertFalse(path.exists())
+
+    def test_evict_least_recently_used(self):
+        cache = BuildCache(self.backend, 150)
+        for i, key in enumerate(("aa01", "aa02", "aa03")):
+            cache.put(key, "x" * 10)
+            os.utime(self.backend.path(key), (i, i))
+        cache.evict()
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(
+            sorted(key for key, _, _ in self.backend.entries()), ["aa02", "aa03"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
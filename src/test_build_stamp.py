@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from build_stamp import input_stamp, is_up_to_date, remove_stamp, write_stamp
+
+
+class TestBuildStamp(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.content = self.root / "content"
+        (self.content / "blog").mkdir(parents=True)
+        (self.content / "blog" / "post.md").write_text("# Post")
+        (self.content / "__pycache__").mkdir()
+        self.output = self.root / "public"
+        self.output.mkdir()
+        self.stamp_path = os.fspath(self.root / ".cache" / "build-stamp")
+
+    def stamp(self, *options: str) -> str:
+        return input_stamp(
+            [os.fspath(self.content), os.fspath(self.root / "missing")], list(options)
+        )
+
+    def test_dangling_link(self):
+        (self.content / ".#post.md").symlink_to(self.content / "nowhere")
+        self.assertIn(f"{self.content / '.#post.md'}\t-", self.stamp("0.1"))
+
+    def test_unchanged_inputs_are_up_to_date(self):
+        self.assertFalse(is_up_to_date(self.stamp_path, self.stamp("0.1")))
+        write_stamp(self.stamp_path, os.fspath(self.output), self.stamp("0.1"))
+        self.assertTrue(is_up_to_date(self.stamp_path, self.stamp("0.1")))
+        (self.content / "__pycache__" / "x.pyc").write_bytes(b"")
+        self.assertTrue(is_up_to_date(self.stamp_path, self.stamp("0.1")))
+
+    def test_changes_invalidate_stamp(self):
+        write_stamp(self.stamp_path, os.fspath(self.output), self.stamp("0.1"))
+        self.assertFalse(is_up_to_date(self.stamp_path, self.stamp("0.2")))
+        self.assertFalse(is_up_to_date(self.stamp_path, self.stamp("0.1", "--dev")))
+        (self.content / "new.md").write_text("# New")
+        self.assertFalse(is_up_to_date(self.stamp_path, self.stamp("0.1")))
+
+    def test_missing_output_is_not_up_to_date(self):
+        write_stamp(self.stamp_path, os.fspath(self.output), self.stamp())
+        self.output.rmdir()
+        self.assertFalse(is_up_to_date(self.stamp_path, self.stamp()))
+
+    def test_remove_stamp(self):
+        write_stamp(self.stamp_path, os.fspath(self.output), self.stamp())
+        remove_stamp(self.stamp_path)
+        remove_stamp(self.stamp_path)
+        self.assertFalse(is_up_to_date(self.stamp_path, self.stamp()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from frontmatter import read_page_metadata, split_front_matter
+
+
+class TestSplitFrontMatter(unittest.TestCase):
+    def test_without_front_matter(self):
+        markdown = "# Title\n\nText"
+        self.assertEqual(split_front_matter(markdown), ({}, markdown))
+
+    def test_with_front_matter(self):
+        markdown = "---\ntitle: Hello\ndate: 2024-01-02\n---\n# Heading\n\nText"
+        self.assertEqual(
+            split_front_matter(markdown),
+            ({"title": "Hello", "date": "2024-01-02"}, "# Heading\n\nText"),
+        )
+
+    def test_lists(self):
+        markdown = "---\ntags: [a, 'b c']\nauthors:\n  - Bilbo\n  - Frodo\n---\n"
+        self.assertEqual(
+            split_front_matter(markdown)[0],
+            {"tags": ["a", "b c"], "authors": ["Bilbo", "Frodo"]},
+        )
+
+    def test_quoted_value(self):
+        markdown = '---\ntitle: "Colon: inside"\n---\n'
+        self.assertEqual(split_front_matter(markdown)[0], {"title": "Colon: inside"})
+
+    def test_missing_closing_delimiter(self):
+        self.assertRaises(ValueError, split_front_matter, "---\ntitle: Hello\n")
+
+    def test_invalid_line(self):
+        self.assertRaises(ValueError, split_front_matter, "---\nnot valid\n---\n")
+
+
+class TestReadPageMetadata(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.path = self.root / "page.md"
+
+    def test_front_matter(self):
+        self.path.write_text("---\ntitle: Hello\ntags: [x]\n---\n# Heading\n")
+        self.assertEqual(
+            read_page_metadata(self.path), {"title": "Hello", "tags": ["x"]}
+        )
+
+    def test_title_from_heading(self):
+        self.path.write_text("---\ndate: 2024-01-02\n---\n\n# Heading\n\nText")
+        self.assertEqual(
+            read_page_metadata(self.path), {"date": "2024-01-02", "title": "Heading"}
+        )
+
+    def test_title_without_front_matter(self):
+        self.path.write_text("# Heading\n\nText")
+        self.assertEqual(read_page_metadata(self.path), {"title": "Heading"})
+
+
+if __name__ == "__main__":
+    unittest.main()
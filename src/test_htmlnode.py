@@ -12,6 +12,12 @@ class TestHTMLNode(unittest.TestCase):
         node = HTMLNode(props={"prop1": "value1", "prop2": "value2"})
         self.assertEqual(node.props_to_html(), ' prop1="value1" prop2="value2"')
 
+    def test_props_to_html_escapes_values(self):
+        node = HTMLNode(props={"alt": 'Say "hi" & <wave>'})
+        self.assertEqual(
+            node.props_to_html(), ' alt="Say &quot;hi&quot; &amp; &lt;wave&gt;"'
+        )
+
     def test_repr(self):
         node = HTMLNode(
             tag="div",
@@ -0,0 +1,103 @@
+import io
+import os
+import struct
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from htmlnode import LeafNode, ParentNode
+from images import ImageSizeIndex, add_image_attributes, read_image_size
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00\x00\x00\x0dIHDR" + struct.pack(">II", 640, 480)
+GIF = b"GIF89a" + struct.pack("<HH", 32, 16) + b"\x00" * 8
+JPEG = (
+    b"\xff\xd8"
+    + b"\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    + b"\xff\xc0\x00\x11\x08"
+    + struct.pack(">HH", 600, 800)
+    + b"\x03" * 10
+)
+WEBP_VP8X = b"RIFF\x00\x00\x00\x00WEBPVP8X" + b"\x00" * 8 + b"\x3f\x01\x00\xc7\x00\x00"
+WEBP_VP8L = b"RIFF\x00\x00\x00\x00WEBPVP8L\x00\x00\x00\x00\x2f" + (
+    (99 | (49 << 14)).to_bytes(4, "little")
+)
+WEBP_VP8 = (
+    b"RIFF\x00\x00\x00\x00WEBPVP8 \x00\x00\x00\x00\x00\x00\x00\x9d\x01\x2a"
+    + struct.pack("<HH", 120, 90)
+)
+
+
+class TestReadImageSize(unittest.TestCase):
+    def test_png(self):
+        self.assertEqual(read_image_size(io.BytesIO(PNG)), (640, 480))
+
+    def test_gif(self):
+        self.assertEqual(read_image_size(io.BytesIO(GIF)), (32, 16))
+
+    def test_jpeg(self):
+        self.assertEqual(read_image_size(io.BytesIO(JPEG)), (800, 600))
+
+    def test_webp(self):
+        self.assertEqual(read_image_size(io.BytesIO(WEBP_VP8X)), (320, 200))
+        self.assertEqual(read_image_size(io.BytesIO(WEBP_VP8L)), (100, 50))
+        self.assertEqual(read_image_size(io.BytesIO(WEBP_VP8)), (120, 90))
+
+    def test_unknown(self):
+        self.assertIsNone(read_image_size(io.BytesIO(b"not an image")))
+
+
+class TestImageSizeIndex(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.static = self.root / "static"
+        (self.static / "images").mkdir(parents=True)
+        (self.static / "images" / "a.png").write_bytes(PNG)
+        (self.static / "images" / "copy.png").write_bytes(PNG)
+        (self.static / "b.gif").write_bytes(GIF)
+        (self.static / "index.css").write_text("body {}")
+        self.enterContext(redirect_stdout(StringIO()))
+
+    def test_scan(self):
+        index = ImageSizeIndex(self.root / "images.json")
+        self.assertEqual(
+            index.scan(self.static),
+            {
+                "/b.gif": (32, 16),
+                "/images/a.png": (640, 480),
+                "/images/copy.png": (640, 480),
+            },
+        )
+        self.assertEqual(index.headers_read, 2)
+
+    def test_headers_read_once_across_builds(self):
+        index = ImageSizeIndex(self.root / "images.json")
+        index.scan(self.static)
+        index.save()
+        os.utime(self.static / "b.gif", ns=(0, 0))
+        index = ImageSizeIndex(self.root / "images.json")
+        self.assertEqual(index.scan(self.static)["/b.gif"], (32, 16))
+        self.assertEqual(index.headers_read, 0)
+
+
+class TestAddImageAttributes(unittest.TestCase):
+    def test_add_image_attributes(self):
+        node = ParentNode(
+            "p",
+            [
+                LeafNode("img", "", {"src": "/a.png", "alt": "A"}),
+                LeafNode("img", "", {"src": "https://example.com/b.png", "alt": "B"}),
+            ],
+        )
+        add_image_attributes(node, {"/a.png": (640, 480)})
+        self.assertEqual(
+            node.to_html(),
+            '<p><img src="/a.png" alt="A" width="640" height="480" loading="lazy"'
+            ' decoding="async"></img><img src="https://example.com/b.png" alt="B"'
+            ' loading="lazy" decoding="async"></img></p>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
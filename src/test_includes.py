@@ -0,0 +1,85 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from includes import IncludeLibrary, find_includes
+from rendering import PageRenderer
+
+
+class TestFindIncludes(unittest.TestCase):
+    def test_block_directives_only(self):
+        markdown = (
+            "# Page\n\n{{ include a.md }}\n\n"
+            "Text {{ include b.md }}\n\n{{ include sub/c.md }}\n\n{{ include a.md }}"
+        )
+        self.assertEqual(find_includes(markdown), ["a.md", "sub/c.md"])
+
+
+class TestIncludeLibrary(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.folder = self.root / "includes"
+        self.folder.mkdir()
+        (self.folder / "legal.md").write_text("Legal **text**\n\n{{ include note.md }}")
+        (self.folder / "note.md").write_text("---\ntitle: Note\n---\n## Note")
+        (self.root / "secret.md").write_text("Secret")
+
+    def test_dependencies_are_transitive(self):
+        library = IncludeLibrary(self.folder)
+        self.assertEqual(
+            library.dependencies("# Page\n\n{{ include legal.md }}"),
+            ["legal.md", "note.md"],
+        )
+        self.assertEqual(library.dependencies("# Page"), [])
+
+    def test_cycle(self):
+        (self.folder / "note.md").write_text("{{ include legal.md }}")
+        library = IncludeLibrary(self.folder)
+        with self.assertRaisesRegex(ValueError, "legal.md -> note.md -> legal.md"):
+            library.dependencies("{{ include legal.md }}")
+        renderer = PageRenderer("{{ Content }}", includes=library)
+        with self.assertRaisesRegex(ValueError, "Include cycle"):
+            renderer.render("# Page\n\n{{ include note.md }}")
+
+    def test_missing_or_outside_folder(self):
+        library = IncludeLibrary(self.folder)
+        with self.assertRaisesRegex(ValueError, "Include not found"):
+            library.source("missing.md")
+        with self.assertRaisesRegex(ValueError, "Include not found"):
+            library.source("../secret.md")
+
+    def test_fragments_render_once(self):
+        library = IncludeLibrary(self.folder)
+        renderer = PageRenderer("{{ Title }}|{{ Content }}", includes=library)
+        first = renderer.render("# One\n\n{{ include legal.md }}")
+        second = renderer.render(
+            "# Two\n\n{{ include note.md }}\n\n{{ include legal.md }}"
+        )
+        self.assertEqual(
+            first,
+            "One|<div><h1>One</h1><p>Legal <b>text</b></p><h2>Note</h2></div>",
+        )
+        self.assertTrue(
+            second.endswith("<h2>Note</h2><p>Legal <b>text</b></p><h2>Note</h2></div>")
+        )
+        self.assertEqual(library.renders, 2)
+
+    def test_cache_key_tracks_dependencies(self):
+        renderer = PageRenderer("{{ Content }}", includes=IncludeLibrary(self.folder))
+        page, other = "# Page\n\n{{ include legal.md }}", "# Other"
+        keys = (renderer.cache_key(page), renderer.cache_key(other))
+
+        (self.folder / "note.md").write_text("## Changed")
+        renderer = PageRenderer("{{ Content }}", includes=IncludeLibrary(self.folder))
+        self.assertNotEqual(renderer.cache_key(page), keys[0])
+        self.assertEqual(renderer.cache_key(other), keys[1])
+
+    def test_directive_is_text_without_library(self):
+        self.assertEqual(
+            PageRenderer("{{ Content }}").render("# Page\n\n{{ include legal.md }}"),
+            "<div><h1>Page</h1><p>{{ include legal.md }}</p></div>",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from link_graph import (
+    LinkGraph,
+    extract_links,
+    normalize_link,
+    output_urls,
+    prefetch_tags,
+)
+
+
+class TestExtractLinks(unittest.TestCase):
+    def test_links_without_images(self):
+        markdown = "---\ntitle: Hi\n---\n[a](/a) ![img](/b.png) [c](https://x.org)"
+        self.assertEqual(extract_links(markdown), ["/a", "https://x.org"])
+
+    def test_normalize_link(self):
+        self.assertEqual(normalize_link("/a/", "/"), "/a/")
+        self.assertEqual(normalize_link("../b", "/a/"), "/b")
+        self.assertEqual(normalize_link("c.html#top", "/a/"), "/a/c.html")
+        self.assertIsNone(normalize_link("https://x.org/", "/"))
+        self.assertIsNone(normalize_link("#top", "/"))
+        self.assertIsNone(normalize_link("mailto:me@x.org", "/"))
+
+    def test_output_urls(self):
+        self.assertEqual(
+            output_urls(["index.html", "a/index.html", "a.css"]),
+            {"/index.html", "/", "/a/index.html", "/a/", "/a", "/a.css"},
+        )
+
+    def test_prefetch_tags(self):
+        self.assertEqual(
+            prefetch_tags(["/a/", "/b/"]),
+            '<link rel="prefetch" href="/a/"><link rel="prefetch" href="/b/">',
+        )
+        self.assertEqual(
+            prefetch_tags(['/a"><script>/', "/b&c/"]),
+            '<link rel="prefetch" href="/a&quot;&gt;&lt;script&gt;/">'
+            '<link rel="prefetch" href="/b&amp;c/">',
+        )
+
+
+class TestLinkGraph(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.content = self.root / "content"
+        (self.content / "a").mkdir(parents=True)
+        (self.content / "b").mkdir()
+        (self.content / "index.md").write_text("[a](/a/) [b](/b) [gone](/gone)")
+        (self.content / "a" / "index.md").write_text("[b](../b/) [home](/)")
+        (self.content / "b" / "index.md").write_text("[self](/b/) [a](/a)")
+        self.graph_path = self.root / "links.json"
+        self.known = output_urls(["index.html", "a/index.html", "b/index.html"])
+
+    def test_skips_dangling_links(self):
+        (self.content / ".#index.md").symlink_to(self.content / "nowhere")
+        graph = LinkGraph(self.graph_path)
+        graph.update(self.content)
+        self.assertNotIn(".#index.md", graph.pages)
+
+    def test_broken_links(self):
+        graph = LinkGraph(self.graph_path)
+        graph.update(self.content)
+        self.assertEqual(graph.broken_links(self.known), [("index.md", "/gone")])
+
+    def test_prefetch_ranked_by_inbound_links(self):
+        graph = LinkGraph(self.graph_path)
+        graph.update(self.content)
+        self.assertEqual(
+            graph.inbound_counts(), {"/a/": 2, "/b/": 3, "/gone/": 1, "/": 1}
+        )
+        prefetch = graph.prefetch_urls(self.known, 1)
+        self.assertEqual(prefetch["index.md"], ["/b/"])
+        self.assertEqual(prefetch["a/index.md"], ["/b/"])
+        self.assertEqual(prefetch["b/index.md"], ["/a/"])
+
+    def test_update_reparses_only_changed_pages(self):
+        graph = LinkGraph(self.graph_path)
+        graph.update(self.content)
+        graph.save()
+
+        page = self.content / "a" / "index.md"
+        page.write_text("[gone](/gone/again)")
+        stat = page.stat()
+        os.utime(page, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        (self.content / "b" / "index.md").unlink()
+
+        graph = LinkGraph(self.graph_path)
+        graph.update(self.content)
+        self.assertEqual(sorted(graph.pages), ["a/index.md", "index.md"])
+        self.assertEqual(graph.pages["a/index.md"]["links"], ["/gone/again"])
+        self.assertEqual(graph.pages["index.md"]["links"], ["/a/", "/b", "/gone"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from livereload import (
+    CLIENT_SCRIPT,
+    ContentWatcher,
+    ReloadBroker,
+    inject_live_reload,
+    normalize_page_path,
+)
+
+
+class TestInjectLiveReload(unittest.TestCase):
+    def test_before_body_end(self):
+        self.assertEqual(
+            inject_live_reload("<body>x</body>"),
+            f"<body>x{CLIENT_SCRIPT}\n</body>",
+        )
+
+    def test_without_body(self):
+        self.assertEqual(inject_live_reload("x"), f"x{CLIENT_SCRIPT}")
+
+
+class TestReloadBroker(unittest.TestCase):
+    def setUp(self):
+        self.enterContext(redirect_stdout(StringIO()))
+
+    def test_normalize_page_path(self):
+        self.assertEqual(normalize_page_path("/blog/index.html"), "/blog/")
+        self.assertEqual(normalize_page_path("/blog/post.html"), "/blog/post.html")
+
+    def test_publish_only_to_page(self):
+        broker = ReloadBroker()
+        majesty = broker.subscribe("/majesty/")
+        home = broker.subscribe("/index.html")
+        self.assertEqual(broker.publish("/majesty/", time.perf_counter()), 1)
+        self.assertEqual(majesty.get_nowait(), "/majesty/")
+        self.assertTrue(home.empty())
+
+    def test_unsubscribe(self):
+        broker = ReloadBroker()
+        listener = broker.subscribe("/")
+        broker.unsubscribe("/", listener)
+        self.assertEqual(broker.publish("/", time.perf_counter()), 0)
+        self.assertEqual(broker.listeners, {})
+
+    def test_stats(self):
+        broker = ReloadBroker()
+        self.assertEqual(broker.stats(), {"notifications": 0})
+        broker.publish("/", time.perf_counter())
+        self.assertEqual(broker.stats()["notifications"], 1)
+
+
+class TestContentWatcher(unittest.TestCase):
+    def test_poll(self):
+        with tempfile.TemporaryDirectory() as directory:
+            content = Path(directory)
+            (content / "a.md").write_text("# A")
+            (content / "b.md").write_text("# B")
+            watcher = ContentWatcher(content)
+            self.assertEqual(watcher.poll(), [])
+            os.utime(content / "b.md", ns=(0, 0))
+            (content / "c.md").write_text("# C")
+            self.assertEqual(watcher.poll(), [content / "b.md", content / "c.md"])
+            self.assertEqual(watcher.poll(), [])
+
+    def test_poll_skips_dangling_links(self):
+        with tempfile.TemporaryDirectory() as directory:
+            content = Path(directory)
+            (content / "a.md").write_text("# A")
+            watcher = ContentWatcher(content)
+            (content / ".#a.md").symlink_to(content / "nowhere")
+            os.utime(content / "a.md", ns=(0, 0))
+            self.assertEqual(watcher.poll(), [content / "a.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from load_report import build_report, parse_mix, percentile
+
+
+class TestParseMix(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(
+            parse_mix("page=80, css=10,missing=5"),
+            {"page": 80, "css": 10, "missing": 5},
+        )
+
+    def test_invalid_weight(self):
+        with self.assertRaises(ValueError):
+            parse_mix("page=many")
+
+
+class TestPercentile(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_ranks(self):
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile(values, 100), 100.0)
+        self.assertEqual(percentile([3.0], 1), 3.0)
+
+
+class TestBuildReport(unittest.TestCase):
+    def test_report(self):
+        results = [
+            ("page", 2.0, 200),
+            ("page", 4.0, 500),
+            ("missing", 1.0, 404),
+            ("css", 3.0, None),
+        ]
+        report = build_report(results, 2.0, {"seed": 0})
+        self.assertEqual(report["config"], {"seed": 0})
+        self.assertEqual(report["completed"], 4)
+        self.assertEqual(report["throughput_rps"], 2.0)
+        self.assertEqual(report["latency_ms"]["mean"], 2.5)
+        self.assertEqual(report["latency_ms"]["p50"], 2.0)
+        self.assertEqual(report["latency_ms"]["max"], 4.0)
+        self.assertEqual(report["statuses"], {"200": 1, "500": 1, "404": 1, "None": 1})
+        self.assertEqual(report["errors"], 2)
+        self.assertEqual(report["error_rate"], 0.5)
+
+    def test_empty(self):
+        report = build_report([], 0.0, {})
+        self.assertEqual(report["throughput_rps"], 0.0)
+        self.assertEqual(report["latency_ms"]["mean"], 0.0)
+        self.assertEqual(report["latency_ms"]["max"], 0.0)
+        self.assertEqual(report["error_rate"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from main import (
+    cli,
+    list_builds,
+    load_render_options,
+    prune_builds,
+    publish_folder,
+    rebuild_changed_pages,
+    rebuild_page,
+    rollback_public,
+    save_render_options,
+)
+from rendering import PageRenderer
+from version import GENERATOR_VERSION
+
+
+class TestPublishFolder(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.builds = self.root / ".builds"
+        self.public = self.root / "public"
+        self.enterContext(redirect_stdout(StringIO()))
+
+    def make_build(self, name: str, content: str) -> Path:
+        build = self.builds / name
+        build.mkdir(parents=True)
+        (build / "index.html").write_text(content)
+        return build
+
+    def test_publish(self):
+        publish_folder(self.make_build("1", "first"), self.public)
+        self.assertEqual((self.public / "index.html").read_text(), "first")
+
+    def test_publish_replaces_previous(self):
+        publish_folder(self.make_build("1", "first"), self.public)
+        publish_folder(self.make_build("2", "second"), self.public)
+        self.assertEqual((self.public / "index.html").read_text(), "second")
+
+    def test_publish_moves_real_folder(self):
+        self.public.mkdir()
+        (self.public / "index.html").write_text("legacy")
+        publish_folder(self.make_build("1", "first"), self.public)
+        self.assertEqual((self.public / "index.html").read_text(), "first")
+        self.assertEqual(len(list_builds(self.builds)), 2)
+
+    def test_rollback(self):
+        publish_folder(self.make_build("1", "first"), self.public)
+        publish_folder(self.make_build("2", "second"), self.public)
+        rollback_public(self.builds, self.public)
+        self.assertEqual((self.public / "index.html").read_text(), "first")
+
+    def test_rollback_without_previous(self):
+        publish_folder(self.make_build("1", "first"), self.public)
+        self.assertRaises(ValueError, rollback_public, self.builds, self.public)
+
+    def test_prune_builds(self):
+        for name in ("1", "2", "3"):
+            publish_folder(self.make_build(name, name), self.public)
+        prune_builds(self.builds, self.public, 2).join()
+        self.assertEqual([b.name for b in list_builds(self.builds)], ["2", "3"])
+        self.assertEqual((self.public / "index.html").read_text(), "3")
+
+    def test_rename_fallback(self):
+        with mock.patch.object(Path, "symlink_to", side_effect=OSError):
+            for name in ("1", "2", "3"):
+                publish_folder(self.make_build(name, name), self.public)
+                prune_builds(self.builds, self.public, 2).join()
+            self.assertFalse(self.public.is_symlink())
+            self.assertEqual((self.public / "index.html").read_text(), "3")
+            self.assertEqual(len(list_builds(self.builds)), 1)
+
+            rollback_public(self.builds, self.public)
+            self.assertEqual((self.public / "index.html").read_text(), "2")
+
+
+class TestRebuildPage(unittest.TestCase):
+    def test_rebuild_page(self):
+        with tempfile.TemporaryDirectory() as directory, redirect_stdout(StringIO()):
+            root = Path(directory)
+            (root / "content" / "blog").mkdir(parents=True)
+            source = root / "content" / "blog" / "index.md"
+            source.write_text("# Blog")
+            renderer = PageRenderer("{{ Content }}")
+            url = rebuild_page(source, root / "content", renderer, root / "out")
+            self.assertEqual(url, "/blog/")
+            self.assertEqual(
+                (root / "out" / "blog" / "index.html").read_text(),
+                "<div><h1>Blog</h1></div>",
+            )
+
+    def test_rebuild_changed_pages_survives_errors(self):
+        with tempfile.TemporaryDirectory() as directory, redirect_stdout(StringIO()):
+            root = Path(directory)
+            (root / "content").mkdir()
+            broken, other = root / "content" / "index.md", root / "content" / "b.md"
+            broken.write_text("# Home\n\nbroken **bold")
+            other.write_text("# Other")
+            renderer = PageRenderer("{{ Content }}")
+            record: dict[str, list[str]] = {}
+
+            urls = rebuild_changed_pages(
+                [broken, other],
+                root / "content",
+                lambda: renderer,
+                root / "out",
+                record,
+            )
+            self.assertEqual(urls, ["/b.html"])
+            self.assertFalse((root / "out" / "index.html").exists())
+
+            broken.write_text("# Home\n\nfixed **bold**")
+            urls = rebuild_changed_pages(
+                [broken], root / "content", lambda: renderer, root / "out", record
+            )
+            self.assertEqual(urls, ["/"])
+            self.assertEqual(
+                (root / "out" / "index.html").read_text(),
+                "<div><h1>Home</h1><p>fixed <b>bold</b></p></div>",
+            )
+
+
+class TestRenderOptions(unittest.TestCase):
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            options_path = Path(directory) / "render-options.json"
+            self.assertFalse(load_render_options(options_path)["fingerprint_assets"])
+            save_render_options(options_path, True, 2048, 0)
+            self.assertEqual(
+                load_render_options(options_path),
+                {
+                    "fingerprint_assets": True,
+                    "inline_css_threshold": 2048,
+                    "prefetch_limit": 0,
+                },
+            )
+
+
+class TestFillPage(unittest.TestCase):
+    def test_title_escaped(self):
+        renderer = PageRenderer("<title>{{ Title }}</title>{{ Content }}")
+        self.assertEqual(
+            renderer.render("# A & B"),
+            "<title>A &amp; B</title><div><h1>A &amp; B</h1></div>",
+        )
+
+
+class TestStartup(unittest.TestCase):
+    def test_import_defers_build_modules(self):
+        deferred = ["argparse", "pipeline", "rendering", "shutil", "threading"]
+        script = f"import main, sys; print([m for m in {deferred} if m in sys.modules])"
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_version(self):
+        output = StringIO()
+        with redirect_stdout(output):
+            cli(["--version"])
+        self.assertEqual(output.getvalue().strip(), GENERATOR_VERSION)
+
+
+if __name__ == "__main__":
+    unittest.main()
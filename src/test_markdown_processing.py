@@ -432,6 +432,16 @@ this is paragraph text
             ),
         )
 
+    def test_escapes_text(self):
+        md = "Use `<br>` & [a <tag>](/x?a=1&b=2)"
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            (
+                "<div><p>Use <code>&lt;br&gt;</code> &amp; "
+                '<a href="/x?a=1&amp;b=2">a &lt;tag&gt;</a></p></div>'
+            ),
+        )
+
 
 class TestExtractTitle(unittest.TestCase):
     def test_no_title(self):
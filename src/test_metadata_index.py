@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from metadata_index import (
+    listing_pages,
+    load_index,
+    page_url,
+    tag_slug,
+    tag_slugs,
+    update_index,
+)
+
+
+class TestPageUrl(unittest.TestCase):
+    def test_index(self):
+        self.assertEqual(page_url(Path("index.md")), "/")
+
+    def test_nested_index(self):
+        self.assertEqual(page_url(Path("majesty/index.md")), "/majesty/")
+
+    def test_page(self):
+        self.assertEqual(page_url(Path("blog/post.md")), "/blog/post.html")
+
+
+class TestTagSlug(unittest.TestCase):
+    def test_slug(self):
+        self.assertEqual(tag_slug("Middle Earth!"), "middle-earth")
+
+    def test_colliding_and_empty_slugs(self):
+        slugs = tag_slugs(["C", "C++", "Rust", "日本", "中文"])
+        self.assertEqual(slugs["Rust"], "rust")
+        self.assertRegex(slugs["C"], "^c-[0-9a-f]{8}$")
+        self.assertRegex(slugs["日本"], "^[0-9a-f]{8}$")
+        self.assertEqual(len(set(slugs.values())), 5)
+
+
+class TestMetadataIndex(unittest.TestCase):
+    def setUp(self):
+        self.content = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(redirect_stdout(StringIO()))
+        self.write("index.md", "# Home\n\nWelcome")
+        self.write("a.md", "---\ntitle: A\ndate: 2024-01-01\ntags: [x]\n---\nText")
+        self.write("b.md", "---\ndate: 2024-02-01\ntags: [x, y]\n---\n# B\n\nText")
+        self.write("c.md", "---\ntitle: C\ndate: 2024-03-01\n---\nText")
+
+    def write(self, name: str, text: str) -> None:
+        (self.content / name).write_text(text)
+
+    def test_orderings(self):
+        index = load_index(self.content / "missing.json")
+        self.assertTrue(update_index(index, self.content))
+        self.assertEqual(index["orderings"]["date"], ["c.md", "b.md", "a.md"])
+        self.assertEqual(
+            index["orderings"]["tags"], {"x": ["b.md", "a.md"], "y": ["b.md"]}
+        )
+        self.assertEqual(index["pages"]["b.md"]["title"], "B")
+
+    def test_skips_dangling_links(self):
+        (self.content / ".#a.md").symlink_to(self.content / "nowhere")
+        index = load_index(self.content / "missing.json")
+        update_index(index, self.content)
+        self.assertNotIn(".#a.md", index["pages"])
+
+    def test_unchanged(self):
+        index = load_index(self.content / "missing.json")
+        update_index(index, self.content)
+        self.assertFalse(update_index(index, self.content))
+
+    def test_changed(self):
+        index = load_index(self.content / "missing.json")
+        update_index(index, self.content)
+        self.write("a.md", "---\ntitle: A2\ndate: 2024-04-01\n---\nText")
+        os.utime(self.content / "a.md", ns=(0, 0))
+        self.assertTrue(update_index(index, self.content))
+        self.assertEqual(index["orderings"]["date"], ["a.md", "c.md", "b.md"])
+
+    def test_listing_pages(self):
+        index = load_index(self.content / "missing.json")
+        update_index(index, self.content)
+        listings = listing_pages(index, 2)
+        self.assertEqual(
+            [listing.output_path() for listing in listings],
+            [
+                "archive/index.html",
+                "archive/page/2/index.html",
+                "tags/x/index.html",
+                "tags/y/index.html",
+            ],
+        )
+        self.assertEqual(
+            listings[1].to_html_node().to_html(),
+            '<div><h1>Archive</h1><ul><li><a href="/a.html">A</a> (2024-01-01)</li>'
+            '</ul><p><a href="/archive/">Newer</a></p></div>',
+        )
+
+    def test_signature_changes_with_metadata(self):
+        index = load_index(self.content / "missing.json")
+        update_index(index, self.content)
+        before = [listing.signature() for listing in listing_pages(index, 10)]
+        self.write("c.md", "---\ntitle: C2\ndate: 2024-03-01\n---\nText")
+        os.utime(self.content / "c.md", ns=(0, 0))
+        update_index(index, self.content)
+        after = [listing.signature() for listing in listing_pages(index, 10)]
+        self.assertNotEqual(before[0], after[0])
+        self.assertEqual(before[1:], after[1:])
+
+    def test_listing_paths_unique_for_colliding_tags(self):
+        self.write(
+            "d.md", "---\ndate: 2024-05-01\ntags: [C, C++, 日本, 中文]\n---\nText"
+        )
+        index = load_index(self.content / "missing.json")
+        update_index(index, self.content)
+        paths = [listing.output_path() for listing in listing_pages(index, 10)]
+        self.assertEqual(len(paths), len(set(paths)))
+        self.assertIn("tags/x/index.html", paths)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import struct
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from images import ImageSizeIndex
+from on_demand import OnDemandRenderer, PageCache
+
+
+class TestPageCache(unittest.TestCase):
+    def test_hit_and_version_miss(self):
+        cache = PageCache(100)
+        cache.put(Path("a"), (1, 1), b"html")
+        self.assertEqual(cache.get(Path("a"), (1, 1)), b"html")
+        self.assertIsNone(cache.get(Path("a"), (2, 1)))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = PageCache(10)
+        cache.put(Path("a"), (1, 1), b"aaaa")
+        cache.put(Path("b"), (1, 1), b"bbbb")
+        cache.get(Path("a"), (1, 1))
+        cache.put(Path("c"), (1, 1), b"cccc")
+        self.assertEqual(list(cache.entries), [Path("a"), Path("c")])
+        self.assertEqual(cache.size, 8)
+
+    def test_skips_oversized(self):
+        cache = PageCache(3)
+        cache.put(Path("a"), (1, 1), b"aaaa")
+        self.assertEqual(cache.size, 0)
+
+
+class TestOnDemandRenderer(unittest.TestCase):
+    def setUp(self):
+        root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.content = root / "content"
+        (self.content / "blog").mkdir(parents=True)
+        (self.content / "index.md").write_text("# Home")
+        (self.content / "blog" / "index.md").write_text("# Blog")
+        (self.content / "blog" / "post.md").write_text("# Post\n\nText")
+        self.template = root / "template.html"
+        self.template.write_text("<title>{{ Title }}</title>{{ Content }}")
+        self.includes = root / "includes"
+        self.includes.mkdir()
+        (self.includes / "note.md").write_text("A **note**")
+        self.static = root / "static"
+        self.static.mkdir()
+        (self.static / "a.png").write_bytes(
+            b"\x89PNG\r\n\x1a\n\x00\x00\x00\x0dIHDR" + struct.pack(">II", 64, 48)
+        )
+        self.renderer = OnDemandRenderer(
+            self.content,
+            self.template,
+            1000,
+            self.includes,
+            self.static,
+            ImageSizeIndex(root / "images.json"),
+        )
+        self.enterContext(redirect_stdout(StringIO()))
+
+    def test_source_for(self):
+        self.assertEqual(self.renderer.source_for("/").name, "index.md")
+        self.assertEqual(self.renderer.source_for("/blog/").parent.name, "blog")
+        self.assertEqual(self.renderer.source_for("/blog/post.html").name, "post.md")
+        self.assertIsNone(self.renderer.source_for("/missing.html"))
+        self.assertIsNone(self.renderer.source_for("/index.css"))
+        self.assertIsNone(self.renderer.source_for("/../template.html"))
+
+    def test_needs_trailing_slash(self):
+        self.assertTrue(self.renderer.needs_trailing_slash("/blog"))
+        self.assertFalse(self.renderer.needs_trailing_slash("/blog/"))
+        self.assertFalse(self.renderer.needs_trailing_slash("/images"))
+
+    def test_render(self):
+        self.assertEqual(
+            self.renderer.render("/blog/post.html"),
+            b"<title>Post</title><div><h1>Post</h1><p>Text</p></div>",
+        )
+        self.renderer.render("/blog/post.html")
+        self.assertEqual(self.renderer.cache.hits, 1)
+
+    def test_render_invalidates_on_mtime(self):
+        self.renderer.render("/")
+        source = self.content / "index.md"
+        source.write_text("# Changed")
+        os.utime(source, ns=(0, 0))
+        self.assertIn(b"<h1>Changed</h1>", self.renderer.render("/"))
+
+    def test_render_image_sizes(self):
+        (self.content / "index.md").write_text("# Home\n\n![A](/a.png)")
+        self.assertIn(b'width="64" height="48"', self.renderer.render("/"))
+
+    def test_render_error(self):
+        (self.content / "index.md").write_text("broken **bold")
+        with self.assertRaises(ValueError):
+            self.renderer.render("/")
+
+    def test_render_includes(self):
+        (self.content / "index.md").write_text("# Home\n\n{{ include note.md }}")
+        self.assertEqual(
+            self.renderer.render("/"),
+            b"<title>Home</title><div><h1>Home</h1><p>A <b>note</b></p></div>",
+        )
+        self.renderer.render("/")
+        self.assertEqual(self.renderer.cache.hits, 1)
+
+        note = self.includes / "note.md"
+        note.write_text("Changed")
+        os.utime(note, ns=(0, 0))
+        self.assertIn(b"<p>Changed</p>", self.renderer.render("/"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from build_cache import BuildCache, LocalDirectoryBackend
+from main import collect_pages
+from pipeline import StageStats, run_pipeline
+from rendering import PageRenderer
+from scheduling import RenderStats
+
+
+class TestStageStats(unittest.TestCase):
+    def test_utilization(self):
+        stats = StageStats("read", 2)
+        stats.busy_seconds = 1.0
+        self.assertEqual(stats.utilization(1.0), 0.5)
+        self.assertEqual(stats.utilization(0.0), 0.0)
+
+
+class TestRunPipeline(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.content = self.root / "content"
+        (self.content / "blog").mkdir(parents=True)
+        for i in range(5):
+            (self.content / "blog" / f"post{i}.md").write_text(f"# Post {i}")
+        (self.content / "index.md").write_text("# Home")
+        self.enterContext(redirect_stdout(StringIO()))
+
+    def run_pipeline(self, cache: BuildCache | None) -> list[StageStats]:
+        pages = collect_pages(self.content, self.root / "out")
+        report = run_pipeline(
+            pages,
+            PageRenderer("{{ Title }}|{{ Content }}"),
+            cache,
+            {"read": 2, "render": 2, "write": 2},
+            2,
+        )
+        return report.stages
+
+    def test_writes_pages(self):
+        stages = self.run_pipeline(None)
+        self.assertEqual([stage.items for stage in stages], [6, 6, 6])
+        self.assertEqual(
+            (self.root / "out" / "blog" / "post3.html").read_text(),
+            "Post 3|<div><h1>Post 3</h1></div>",
+        )
+
+    def test_uses_cache(self):
+        cache = BuildCache(LocalDirectoryBackend(self.root / "cache"), 10000)
+        self.run_pipeline(cache)
+        self.run_pipeline(cache)
+        self.assertEqual((cache.misses, cache.hits), (6, 6))
+
+    def test_records_render_stats(self):
+        (self.content / "blog" / "post2.md").write_text("# Post 2\n\n" + "text " * 500)
+        render_stats = RenderStats(self.root / "stats.json")
+        pages = collect_pages(self.content, self.root / "out")
+        report = run_pipeline(
+            pages,
+            PageRenderer("{{ Title }}|{{ Content }}"),
+            None,
+            {"read": 2, "render": 2, "write": 2},
+            2,
+            render_stats,
+        )
+        self.assertEqual(len(render_stats.pages), 6)
+        self.assertIsNotNone(report.makespans)
+        self.assertIn("render makespan", report.lines()[-1])
+        post = (self.content / "blog" / "post2.md").as_posix()
+        self.assertEqual(render_stats.pages[post]["size"], 2510)
+
+
+if __name__ == "__main__":
+    unittest.main()
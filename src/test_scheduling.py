@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from scheduling import RenderStats, simulate_makespan
+
+
+class TestSimulateMakespan(unittest.TestCase):
+    def test_longest_first_shortens_tail(self):
+        costs = [1.0, 1.0, 1.0, 1.0, 4.0]
+        self.assertEqual(simulate_makespan(costs, 2), 6.0)
+        self.assertEqual(simulate_makespan(sorted(costs, reverse=True), 2), 4.0)
+
+    def test_single_worker(self):
+        self.assertEqual(simulate_makespan([1.0, 2.0], 1), 3.0)
+        self.assertEqual(simulate_makespan([], 3), 0.0)
+
+
+class TestRenderStats(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.stats_path = self.root / "stats.json"
+        self.pages = []
+        for name, size in [("a.md", 10), ("b.md", 300), ("c.md", 20)]:
+            (self.root / name).write_text("x" * size)
+            self.pages.append((self.root / name, self.root / f"{name}.html"))
+
+    def test_size_orders_pages_without_history(self):
+        stats = RenderStats(self.stats_path)
+        self.assertEqual(
+            [from_path.name for from_path, _ in stats.schedule(self.pages)],
+            ["b.md", "c.md", "a.md"],
+        )
+
+    def test_recorded_times_override_size(self):
+        stats = RenderStats(self.stats_path)
+        stats.record(self.root / "a.md", 5.0, 10)
+        stats.record(self.root / "b.md", 0.3, 300)
+        stats.save()
+
+        stats = RenderStats(self.stats_path)
+        estimates = stats.estimates([from_path for from_path, _ in self.pages])
+        self.assertEqual(estimates[self.root / "a.md"], 5.0)
+        # Unknown pages are estimated from the average seconds per byte.
+        self.assertAlmostEqual(estimates[self.root / "c.md"], 20 * 5.3 / 310)
+        self.assertEqual(
+            [from_path.name for from_path, _ in stats.schedule(self.pages)],
+            ["a.md", "c.md", "b.md"],
+        )
+
+    def test_changed_page_falls_back_to_estimate(self):
+        stats = RenderStats(self.stats_path)
+        stats.record(self.root / "a.md", 5.0, 10)
+        (self.root / "a.md").write_text("x" * 11)
+        estimates = stats.estimates([self.root / "a.md"])
+        self.assertAlmostEqual(estimates[self.root / "a.md"], 5.5)
+
+    def test_prune(self):
+        stats = RenderStats(self.stats_path)
+        stats.record(self.root / "a.md", 1.0, 10)
+        stats.record(self.root / "gone.md", 1.0, 10)
+        stats.prune([self.root / "a.md"])
+        self.assertEqual(list(stats.pages), [(self.root / "a.md").as_posix()])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from stylesheets import absolutize_css_urls, inline_stylesheets, minify_css
+
+
+class TestMinifyCss(unittest.TestCase):
+    def test_minify(self):
+        css = "/* comment */\nbody {\n    color: #fff;\n    margin: 0;\n}\n"
+        css += "\nh1,\nh2 > a {}"
+        self.assertEqual(minify_css(css), "body{color:#fff;margin:0}h1,h2>a{}")
+
+    def test_keeps_descendant_pseudo_class(self):
+        self.assertEqual(minify_css("div :first-child { }"), "div :first-child{}")
+
+
+class TestAbsolutizeCssUrls(unittest.TestCase):
+    def test_relative(self):
+        self.assertEqual(
+            absolutize_css_urls("a{background:url('../img/a.png')}", "/css/site.css"),
+            "a{background:url('/img/a.png')}",
+        )
+
+    def test_untouched(self):
+        css = "a{background:url(/a.png)}b{background:url(data:image/png;base64,x)}"
+        self.assertEqual(absolutize_css_urls(css, "/css/site.css"), css)
+
+
+class TestInlineStylesheets(unittest.TestCase):
+    def setUp(self):
+        self.static = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        (self.static / "small.css").write_text("body {\n    color: red;\n}\n")
+        (self.static / "large.css").write_text("body { color: red; }\n" * 100)
+        self.enterContext(redirect_stdout(StringIO()))
+
+    def test_inline_small(self):
+        template = '<head><link href="/small.css" rel="stylesheet"></head>'
+        self.assertEqual(
+            inline_stylesheets(template, self.static, 100),
+            "<head><style>body{color:red}</style></head>",
+        )
+
+    def test_preload_large(self):
+        template = '<link href="/large.css" rel="stylesheet">'
+        self.assertEqual(
+            inline_stylesheets(template, self.static, 100),
+            '<link rel="preload" href="/large.css" as="style">' + template,
+        )
+
+    def test_keeps_media(self):
+        template = '<link href="/small.css" rel="stylesheet" media="print">'
+        self.assertEqual(
+            inline_stylesheets(template, self.static, 100),
+            '<style media="print">body{color:red}</style>',
+        )
+        template = '<link href="/large.css" rel="stylesheet" media="print">'
+        self.assertEqual(
+            inline_stylesheets(template, self.static, 100),
+            '<link rel="preload" href="/large.css" as="style" media="print">'
+            + template,
+        )
+
+    def test_untouched_links(self):
+        template = (
+            '<link href="https://example.com/a.css" rel="stylesheet">'
+            '<link href="/missing.css" rel="stylesheet">'
+            '<link href="/small.css" rel="icon">'
+            '<link href="/small.css" rel="stylesheet" title="Alternate">'
+        )
+        self.assertEqual(inline_stylesheets(template, self.static, 100), template)
+
+
+if __name__ == "__main__":
+    unittest.main()
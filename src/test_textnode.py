@@ -1,7 +1,12 @@
 import unittest
 
 from htmlnode import LeafNode
-from textnode import TextNode, TextType, text_node_to_html_node
+from textnode import (
+    TextNode,
+    TextType,
+    text_node_to_html_node,
+    text_nodes_to_html_nodes,
+)
 
 
 class TestTextNode(unittest.TestCase):
@@ -83,6 +88,37 @@ class TestTextNodeToHtmlNode(unittest.TestCase):
         node = TextNode("This is an image node", "unknown")  # type: ignore
         self.assertRaises(ValueError, text_node_to_html_node, node)
 
+    def test_escapes_text(self):
+        node = TextNode("a < b & c", TextType.CODE)
+        self.assertEqual(
+            text_node_to_html_node(node), LeafNode("code", "a &lt; b &amp; c")
+        )
+
+
+class TestTextNodesToHtmlNodes(unittest.TestCase):
+    def test_coalesces_spans_around_links_and_images(self):
+        nodes = [
+            TextNode("Some ", TextType.TEXT),
+            TextNode("bold", TextType.BOLD),
+            TextNode(" & ", TextType.TEXT),
+            TextNode("code", TextType.CODE),
+            TextNode("a link", TextType.LINK, "/a"),
+            TextNode(" then ", TextType.TEXT),
+            TextNode("alt", TextType.IMAGE, "/b.png"),
+        ]
+        self.assertEqual(
+            text_nodes_to_html_nodes(nodes),
+            [
+                LeafNode(None, "Some <b>bold</b> &amp; <code>code</code>"),
+                LeafNode("a", "a link", {"href": "/a"}),
+                LeafNode(None, " then "),
+                LeafNode("img", "", {"src": "/b.png", "alt": "alt"}),
+            ],
+        )
+
+    def test_empty(self):
+        self.assertEqual(text_nodes_to_html_nodes([]), [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from build_cache import BuildCache, LocalDirectoryBackend
+from main import collect_pages
+from rendering import PageRenderer
+from variants import link_files, render_variants
+
+
+class TestRenderVariants(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.content = self.root / "content"
+        (self.content / "blog").mkdir(parents=True)
+        (self.content / "index.md").write_text("# Home")
+        (self.content / "blog" / "post.md").write_text("# Post\n\nSome **text**")
+        self.site = PageRenderer("<main>{{ Content }}</main>")
+        self.print = self.site.with_template("<article>{{ Content }}</article>")
+        self.enterContext(redirect_stdout(StringIO()))
+
+    def render(self, cache: BuildCache | None = None) -> int:
+        return render_variants(
+            collect_pages(self.content, Path()),
+            [self.site, self.print],
+            [self.root / "site", self.root / "print"],
+            cache,
+        )
+
+    def test_parses_each_page_once(self):
+        self.assertEqual(self.render(), 2)
+        self.assertEqual(
+            (self.root / "site" / "blog" / "post.html").read_text(),
+            "<main><div><h1>Post</h1><p>Some <b>text</b></p></div></main>",
+        )
+        self.assertEqual(
+            (self.root / "print" / "blog" / "post.html").read_text(),
+            "<article><div><h1>Post</h1><p>Some <b>text</b></p></div></article>",
+        )
+
+    def test_cached_variants_skip_parsing(self):
+        cache = BuildCache(LocalDirectoryBackend(self.root / "cache"), 100000)
+        self.render(cache)
+        self.assertEqual(self.render(cache), 0)
+
+        self.print = self.site.with_template("<section>{{ Content }}</section>")
+        self.assertEqual(self.render(cache), 2)
+        self.assertEqual((cache.misses, cache.hits), (6, 6))
+
+
+class TestLinkFiles(unittest.TestCase):
+    def test_link_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "source"
+            (source / "images").mkdir(parents=True)
+            (source / "index.css").write_text("body{}")
+            (source / "images" / "a.png").write_bytes(b"png")
+            destination = Path(tmp) / "destination"
+            link_files(source, destination, ["index.css", "images/a.png"])
+            self.assertEqual((destination / "index.css").read_text(), "body{}")
+            self.assertEqual((destination / "images" / "a.png").read_bytes(), b"png")
+
+
+if __name__ == "__main__":
+    unittest.main()
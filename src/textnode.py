@@ -1,6 +1,6 @@
 from enum import StrEnum
 
-from htmlnode import LeafNode
+from htmlnode import TEXT_ESCAPES, HTMLNode, LeafNode
 
 
 class TextType(StrEnum):
@@ -29,22 +29,48 @@ class TextNode:
         return f"TextNode({self.text}, {self.text_type}, {self.url})"
 
 
+LEAF_TAGS = {
+    TextType.TEXT: None,
+    TextType.BOLD: "b",
+    TextType.ITALIC: "i",
+    TextType.CODE: "code",
+}
+SPAN_TAGS = {
+    text_type: (f"<{tag}>", f"</{tag}>") if tag else ("", "")
+    for text_type, tag in LEAF_TAGS.items()
+}
+
+
 def text_node_to_html_node(text_node: TextNode) -> LeafNode:
-    if text_node.text_type == TextType.TEXT:
-        return LeafNode(None, text_node.text)
-    elif text_node.text_type == TextType.BOLD:
-        return LeafNode("b", text_node.text)
-    elif text_node.text_type == TextType.ITALIC:
-        return LeafNode("i", text_node.text)
-    elif text_node.text_type == TextType.CODE:
-        return LeafNode("code", text_node.text)
+    if text_node.text_type in LEAF_TAGS:
+        text = text_node.text.translate(TEXT_ESCAPES)
+        return LeafNode(LEAF_TAGS[text_node.text_type], text)
     elif text_node.text_type == TextType.LINK:
         if text_node.url is None:
             raise ValueError("Invalid text node: missing url")
-        return LeafNode("a", text_node.text, {"href": text_node.url})
+        text = text_node.text.translate(TEXT_ESCAPES)
+        return LeafNode("a", text, {"href": text_node.url})
     elif text_node.text_type == TextType.IMAGE:
         if text_node.url is None:
             raise ValueError("Invalid text node: missing url")
         return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
     else:
         raise ValueError(f"Invalid text type: {text_node.text_type}")
+
+
+def text_nodes_to_html_nodes(text_nodes: list[TextNode]) -> list[HTMLNode]:
+    html_nodes: list[HTMLNode] = []
+    span: list[str] = []
+    for text_node in text_nodes:
+        tags = SPAN_TAGS.get(text_node.text_type)
+        if tags is not None:
+            span += (tags[0], text_node.text.translate(TEXT_ESCAPES), tags[1])
+            continue
+        # Links and images stay nodes so the tree walkers can still find them.
+        if span:
+            html_nodes.append(LeafNode(None, "".join(span)))
+            span = []
+        html_nodes.append(text_node_to_html_node(text_node))
+    if span:
+        html_nodes.append(LeafNode(None, "".join(span)))
+    return html_nodes
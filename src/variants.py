@@ -0,0 +1,62 @@
+import os
+import shutil
+from pathlib import Path
+
+from build_cache import BuildCache
+from rendering import Document, PageRenderer
+
+
+class Variant:
+    def __init__(
+        self, name: str, template_path: Path, public_folder: Path, builds_folder: Path
+    ) -> None:
+        self.name = name
+        self.template_path = template_path
+        self.public_folder = public_folder
+        self.builds_folder = builds_folder
+
+    def __repr__(self) -> str:
+        return f"Variant({self.name}, {self.template_path}, {self.public_folder})"
+
+
+def link_files(source_root: Path, dest_root: Path, names: list[str]) -> None:
+    for name in names:
+        destination = dest_root / name
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            # Hard links share one copy of each static file between variants.
+            os.link(source_root / name, destination)
+        except OSError:
+            shutil.copy(source_root / name, destination)
+
+
+def render_variants(
+    pages: list[tuple[Path, Path]],
+    renderers: list[PageRenderer],
+    dest_dirs: list[Path],
+    cache: BuildCache | None = None,
+) -> int:
+    parses = 0
+    for from_path, relative_path in pages:
+        markdown_content = from_path.read_text()
+        prefetch_urls = renderers[0].prefetch_for(from_path)
+        document: Document | None = None
+        for renderer, dest_dir in zip(renderers, dest_dirs):
+            dest_path = dest_dir / relative_path
+            html = None
+            if cache is not None:
+                key = renderer.cache_key(markdown_content, prefetch_urls)
+                html = cache.get(key)
+            if html is None:
+                if document is None:
+                    document = renderer.render_document(markdown_content)
+                    parses += 1
+                print(f"Generating page from '{from_path}' to '{dest_path}'")
+                html = renderer.fill(document, prefetch_urls)
+                if cache is not None:
+                    cache.put(key, html)
+            else:
+                print(f"Using cached page for '{from_path}' at '{dest_path}'")
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            dest_path.write_text(html)
+    return parses
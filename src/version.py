@@ -0,0 +1 @@
+GENERATOR_VERSION = "0.3.2"
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+DEFAULT_TARGET = "src/main.py"
+BUDGETS_MS = {"version": 75.0, "noop": 90.0}
+SCENARIOS = {"version": ["--version"], "noop": []}
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_us, name = line.split("|")
+        if not cumulative_us.strip().isdigit():
+            continue
+        # Nested imports keep their indentation, top-level ones start unindented.
+        cumulative[name[1:]] = int(cumulative_us)
+    return cumulative
+
+
+def run_once(command: list[str], site: Path, importtime: bool) -> tuple[float, str]:
+    flags = ["-X", "importtime"] if importtime else []
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, *flags, *command],
+        cwd=site,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return (time.perf_counter() - start) * 1000, completed.stderr
+
+
+def measure(target: str, site: Path, arguments: list[str], runs: int) -> dict:
+    command = [os.path.abspath(target), *arguments]
+    wall_ms = sorted(run_once(command, site, False)[0] for _ in range(runs))
+    _, stderr = run_once(command, site, True)
+    imports = parse_importtime(stderr)
+    top_level = [micros for name, micros in imports.items() if name == name.lstrip()]
+    slowest = sorted(imports.items(), key=lambda item: -item[1])[:5]
+    return {
+        "median_ms": round(statistics.median(wall_ms), 2),
+        "min_ms": round(wall_ms[0], 2),
+        "imports_ms": round(sum(top_level) / 1000, 2),
+        "modules": len(imports),
+        "slowest_imports": {name.strip(): micros for name, micros in slowest},
+    }
+
+
+def run_benchmark(
+    target: str, site: Path, runs: int, budgets: dict[str, float]
+) -> dict:
+    # Prime the build stamp so the no-op scenario measures the skip path.
+    subprocess.run(
+        [sys.executable, os.path.abspath(target)],
+        cwd=site,
+        capture_output=True,
+        check=True,
+    )
+    report = {"target": target, "runs": runs, "scenarios": {}}
+    for name, arguments in SCENARIOS.items():
+        result = measure(target, site, arguments, runs)
+        result["budget_ms"] = budgets[name]
+        result["within_budget"] = result["median_ms"] <= budgets[name]
+        report["scenarios"][name] = result
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure generator start-up against a time budget"
+    )
+    parser.add_argument(
+        "--target", type=str, default=DEFAULT_TARGET, help="main.py or a zipapp"
+    )
+    parser.add_argument("--site", type=Path, default=Path("."))
+    parser.add_argument("--runs", type=int, default=10)
+    for name, budget in BUDGETS_MS.items():
+        parser.add_argument(f"--{name}-budget-ms", type=float, default=budget)
+    parser.add_argument("--output", type=str, help="Write the JSON report to a file")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        args.target,
+        args.site,
+        args.runs,
+        {name: getattr(args, f"{name}_budget_ms") for name in BUDGETS_MS},
+    )
+    report_json = json.dumps(report, indent=2)
+    print(report_json)
+    if args.output:
+        Path(args.output).write_text(report_json + "\n")
+    if not all(result["within_budget"] for result in report["scenarios"].values()):
+        print("Start-up time is over budget", file=sys.stderr)
+        sys.exit(1)